@@ -0,0 +1,256 @@
+"""
+Single entry point for the collector and the research jobs:
+
+    python -m src.cli collect  --symbol BTCUSDT ETHUSDT [--uvloop] [--sink unix:/tmp/quotes.sock]
+                               [--profile [--profile-alloc]] [--gc-tune]
+    python -m src.cli bench-loop
+    python -m src.cli stats    --data logs/market_data_20250729.jsonl
+    python -m src.cli backtest --data logs/market_data_20250730.jsonl [--follow state.pkl]
+    python -m src.cli sweep    --train ... --test ... --headless
+    python -m src.cli tune     --train ... --rounds 3 --surrogate --headless
+    python -m src.cli train    --market ... --quotes ... --headless
+
+Every subcommand imports its modules inside its handler, so `collect` never
+pays for pandas/matplotlib/sklearn/lightgbm. With --headless, figures and
+metrics are written to --out-dir instead of opening plot windows.
+"""
+import argparse
+import json
+
+
+def cmd_collect(args):
+    from src import run_collector
+    from src.connectors import eventloop
+    from src.core.profiling import GCPolicy
+    gc_policy = None
+    if args.gc_tune:
+        thresholds = tuple(int(x) for x in args.gc_threshold.split(","))
+        gc_policy = GCPolicy(thresholds, args.gc_warmup)
+    eventloop.run(run_collector.main(args.symbol, args.log_dir, args.calibrate, args.tick,
+                                     args.health_interval, args.sink, args.profile,
+                                     args.profile_interval, gc_policy, args.gamma_port,
+                                     args.cov_halflife, profile_alloc=args.profile_alloc),
+                  use_uvloop=args.uvloop)
+
+
+def cmd_bench_loop(args):
+    from src.connectors import eventloop
+    from src.core.report import write_metrics
+    res = eventloop.benchmark(args.msgs, args.producers, args.repeats)
+    for name, r in res.items():
+        print(f"{name:8s} {r['us_per_msg']:.3f} us/msg  {r['msgs_per_s']:,.0f} msgs/s")
+    write_metrics("bench_loop", res)
+
+
+def cmd_stats(args):
+    from src.core.report import write_metrics
+    from src.core.stats_extract import calc_day_stats
+    stats = calc_day_stats(args.data, args.symbol)
+    print(json.dumps(stats))
+    write_metrics("day_stats", stats)
+
+
+def _ts_ns(value: str | None, default: int) -> int:
+    """Epoch nanoseconds or an ISO-8601 timestamp (UTC) -> ns."""
+    if value is None:
+        return default
+    if value.isdigit():
+        return int(value)
+    import pandas as pd
+    return pd.Timestamp(value, tz="UTC").value
+
+
+def _check_resume(args, bt):
+    """The saved state fixes tape, symbol, fills and config; refuse options that disagree."""
+    import pathlib
+    conflicts = []
+    if pathlib.Path(args.data).resolve() != pathlib.Path(bt.path).resolve():
+        conflicts.append(f"--data {args.data} (state follows {bt.path})")
+    for opt, given, saved in (("--symbol", args.symbol, bt.symbol),
+                              ("--fill-mode", args.fill_mode, bt.fill_mode),
+                              ("--seed", args.seed, getattr(bt, "seed", None))):
+        if given is not None and given != saved:
+            conflicts.append(f"{opt} {given} (state has {saved})")
+    for opt, given in (("--calibrate", args.calibrate), ("--tick", args.tick)):
+        if given is not None:
+            conflicts.append(f"{opt} (the config was calibrated when the state was created)")
+    if conflicts:
+        raise SystemExit(f"backtest: {args.follow} conflicts with " + "; ".join(conflicts))
+
+
+def cmd_backtest(args):
+    import pathlib
+    from src.core.backtest import BackTester
+    from src.core.init_config import build_cfg
+    from src.core.reader import load_range
+    from src.core.report import write_metrics
+    from src.core.stats_extract import calc_day_stats
+    if args.follow and (args.start or args.end):
+        raise SystemExit("backtest: --start/--end cannot be combined with --follow")
+    if args.follow and pathlib.Path(args.follow).exists():
+        # shadow PnL over a growing tape: resume from the saved state, replay only new ticks
+        bt = BackTester.load(args.follow)
+        _check_resume(args, bt)
+        res = bt.update()
+    else:
+        args.symbol = args.symbol or "BTCUSDT"
+        args.fill_mode = args.fill_mode or "deterministic"
+        stats = calc_day_stats(args.calibrate or args.data, args.symbol)
+        cfg = build_cfg(stats, tick=args.tick or 0.01)
+        if args.follow:
+            bt = BackTester.follow(args.data, args.symbol, cfg, args.fill_mode, args.seed)
+            res = bt.update()
+        else:
+            data = args.data
+            if args.start or args.end:
+                # seek straight to the window through the tape's .idx sidecar
+                data = load_range(args.data, _ts_ns(args.start, 0), _ts_ns(args.end, 2**63 - 1), args.symbol)
+            res = BackTester(data, args.symbol, cfg, args.fill_mode, args.seed).run()
+    if args.follow:
+        bt.save(args.follow)
+    print(json.dumps(res))
+    write_metrics("backtest", res)
+
+
+def cmd_sweep(args):
+    from src.core import grid_train
+    grid_train.main(args.train, args.test, args.symbol, args.tick)
+
+
+def cmd_tune(args):
+    import dataclasses
+    from src.core.backtest import BackTester
+    from src.core.init_config import build_cfg
+    from src.core.optimize import Tuner
+    from src.core.reader import load_jsonl
+    from src.core.report import write_metrics
+    from src.core.stats_extract import day_stats
+    train = load_jsonl(args.train)   # parsed once: calibration and every replay
+    base = build_cfg(day_stats(train, args.symbol), tick=args.tick)
+    tuner = Tuner(train, args.symbol, base, fill_mode=args.fill_mode,
+                  eta=args.eta, min_frac=args.min_frac, surrogate=args.surrogate, seed=args.seed)
+    best, history = tuner.run(args.n, args.rounds)
+    summary = {"best_cfg": dataclasses.asdict(best), "replays": len(history)}
+    if args.test:
+        summary["out_of_sample"] = BackTester(args.test, args.symbol, best, args.fill_mode, args.seed).run()
+    print(json.dumps(summary, indent=2))
+    write_metrics("tune_history", history)
+    write_metrics("tune_summary", summary)
+
+
+def cmd_train(args):
+    from src.core import strategy
+    t0 = None if args.start is None else _ts_ns(args.start, 0)
+    t1 = None if args.end is None else _ts_ns(args.end, 0)
+    strategy.main(args.market, args.quotes, t0, t1)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m src.cli")
+    p.add_argument("--headless", action="store_true",
+                   help="batch mode: save figures/metrics to --out-dir, never open windows")
+    p.add_argument("--out-dir", default="reports")
+    # the research jobs also accept the batch flags after the subcommand;
+    # SUPPRESS keeps a subparser from resetting a value given before it
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument("--headless", action="store_true", default=argparse.SUPPRESS,
+                       help="batch mode: save figures/metrics to --out-dir, never open windows")
+    batch.add_argument("--out-dir", default=argparse.SUPPRESS)
+    sub = p.add_subparsers(dest="command", required=True)
+
+    c = sub.add_parser("collect", help="stream OKX + Binance books and record quotes")
+    c.add_argument("--symbol", nargs="+", default=["BTCUSDT"],
+                   help="symbols multiplexed over one socket per venue")
+    c.add_argument("--log-dir", default="logs")
+    c.add_argument("--calibrate", help="market_data tape used to build the MMConfig")
+    c.add_argument("--tick", type=float, default=0.01)
+    c.add_argument("--health-interval", type=float, default=5.0,
+                   help="seconds between feed health records")
+    c.add_argument("--uvloop", action="store_true", help="run on uvloop (optional dependency)")
+    c.add_argument("--sink", action="append",
+                   help="where to publish quotes: null (default), stdout, file:PATH, unix:PATH; repeatable")
+    c.add_argument("--profile", action="store_true",
+                   help="report per-event latency, GC pauses and RSS growth")
+    c.add_argument("--profile-alloc", action="store_true",
+                   help="with --profile, also trace allocations per call site (tracemalloc; "
+                        "inflates latency/GC figures, so leave off when comparing --gc-tune)")
+    c.add_argument("--profile-interval", type=float, default=10.0)
+    c.add_argument("--gc-tune", action="store_true",
+                   help="raise GC thresholds and gc.freeze() after warm-up")
+    c.add_argument("--gc-threshold", default="50000,50,100", help="gen0,gen1,gen2 thresholds for --gc-tune")
+    c.add_argument("--gc-warmup", type=int, default=2000, help="events before gc.freeze() under --gc-tune")
+    c.add_argument("--gamma-port", type=float, default=0.0,
+                   help="risk aversion of the cross-asset covariance skew (0 = off)")
+    c.add_argument("--cov-halflife", type=float, default=60.0,
+                   help="half-life in seconds of the EWMA return covariance")
+    c.set_defaults(func=cmd_collect)
+
+    bl = sub.add_parser("bench-loop", help="compare default asyncio loop vs uvloop overhead",
+                        parents=[batch])
+    bl.add_argument("--msgs", type=int, default=200_000)
+    bl.add_argument("--producers", type=int, default=2)
+    bl.add_argument("--repeats", type=int, default=3)
+    bl.set_defaults(func=cmd_bench_loop)
+
+    s = sub.add_parser("stats", help="median spread and 1s variance of a tape", parents=[batch])
+    s.add_argument("--data", required=True)
+    s.add_argument("--symbol", default="BTCUSDT")
+    s.set_defaults(func=cmd_stats)
+
+    b = sub.add_parser("backtest", help="replay one tape with a calibrated config", parents=[batch])
+    b.add_argument("--data", required=True)
+    b.add_argument("--calibrate", help="tape to calibrate on (defaults to --data)")
+    # no argparse defaults here: on a --follow resume only options actually given are checked
+    b.add_argument("--symbol", help="default BTCUSDT")
+    b.add_argument("--tick", type=float, help="default 0.01")
+    b.add_argument("--fill-mode", choices=["deterministic", "poisson"], help="default deterministic")
+    b.add_argument("--start", help="only replay ticks from here (epoch ns or ISO-8601 UTC)")
+    b.add_argument("--end", help="only replay ticks before this (epoch ns or ISO-8601 UTC)")
+    b.add_argument("--seed", type=int, help="RNG seed for poisson fills")
+    b.add_argument("--follow", metavar="STATE",
+                   help="incremental mode: resume from STATE (created and calibrated on first run), "
+                        "replay only ticks appended to --data since, save STATE again")
+    b.set_defaults(func=cmd_backtest)
+
+    g = sub.add_parser("sweep", help="grid search a_unc/b_impact/kappa, then test out of sample",
+                       parents=[batch])
+    g.add_argument("--train", default="logs/market_data_20250729.jsonl")
+    g.add_argument("--test", default="logs/market_data_20250730.jsonl")
+    g.add_argument("--symbol", default="BTCUSDT")
+    g.add_argument("--tick", type=float, default=0.01)
+    g.set_defaults(func=cmd_sweep)
+
+    o = sub.add_parser("tune", help="successive-halving search over all MMConfig fields", parents=[batch])
+    o.add_argument("--train", default="logs/market_data_20250729.jsonl")
+    o.add_argument("--test", help="optional out-of-sample tape for the winner")
+    o.add_argument("--symbol", default="BTCUSDT")
+    o.add_argument("--tick", type=float, default=0.01)
+    o.add_argument("--fill-mode", choices=["deterministic", "poisson"], default="deterministic")
+    o.add_argument("--n", type=int, default=81, help="candidates per bracket")
+    o.add_argument("--eta", type=int, default=3, help="keep 1/eta per rung, grow tape by eta")
+    o.add_argument("--min-frac", type=float, default=1 / 27, help="tape fraction of the first rung")
+    o.add_argument("--rounds", type=int, default=1)
+    o.add_argument("--surrogate", action="store_true",
+                   help="draw later rounds from a Gaussian-process surrogate (needs sklearn)")
+    o.add_argument("--seed", type=int, default=0)
+    o.set_defaults(func=cmd_tune)
+
+    t = sub.add_parser("train", help="fit the augmented LightGBM strategy model", parents=[batch])
+    t.add_argument("--market", default="logs/market_data_20250730.jsonl")
+    t.add_argument("--quotes", default="logs/quotes_20250730.jsonl")
+    t.add_argument("--start", help="only load rows logged from here (epoch ns or ISO-8601 UTC)")
+    t.add_argument("--end", help="only load rows logged before this (epoch ns or ISO-8601 UTC)")
+    t.set_defaults(func=cmd_train)
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.headless:
+        from src.core.report import set_headless
+        set_headless(args.out_dir)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,33 @@
-import asyncio, json, time, websockets
+import json, time, websockets
 from src.core.book import BinanceBook
+from src.connectors.supervisor import Supervisor
 
-# Using a simpler, stateless stream from Binance
-WS_URL_TEMPLATE = "wss://stream.binance.us:9443/ws/{}@depth5@100ms"
+# Using a simpler, stateless stream from Binance; all symbols share one
+# combined-stream socket and arrive as {"stream": "<sym>@depth5@100ms", "data": {...}}
+WS_URL_TEMPLATE = "wss://stream.binance.us:9443/stream?streams={}"
+STREAM_TEMPLATE = "{}@depth5@100ms"
 
-async def stream(queue, symbol="BTCUSDT"):
-    book = BinanceBook(symbol)
-    url = WS_URL_TEMPLATE.format(symbol.lower())
-    while True:
-        try:
-            async with websockets.connect(url, ping_interval=20) as ws:
-                async for raw in ws:
-                    t_arrive = time.time_ns()
-                    msg = json.loads(raw)
-                    if "bids" in msg:
-                        book.apply_snapshot(msg, t_arrive)
-                        await queue.put(("binance", symbol, book.view()))
-        except Exception as e:
-            print(f"Binance connector error: {e}. Retrying...")
-            await asyncio.sleep(1)
\ No newline at end of file
+def url(symbols):
+    return WS_URL_TEMPLATE.format("/".join(STREAM_TEMPLATE.format(s.lower()) for s in symbols))
+
+async def stream(queue, symbols="BTCUSDT", supervisor: Supervisor | None = None):
+    symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+    books = {s.lower(): BinanceBook(s) for s in symbols}
+    sup = supervisor or Supervisor("binance")
+
+    async def session(health):
+        async with websockets.connect(url(symbols), ping_interval=20) as ws:
+            health.on_connect(time.time_ns())
+            async for raw in ws:
+                t_arrive = time.time_ns()
+                msg = json.loads(raw)
+                data = msg.get("data")
+                if data and "bids" in data:
+                    book = books[msg["stream"].split("@", 1)[0]]
+                    health.on_message(t_arrive, book.symbol)
+                    book.apply_snapshot(data, t_arrive)
+                    await queue.put(("binance", book.symbol, book.view()))
+                else:
+                    health.on_message(t_arrive)
+
+    await sup.run(session)
@@ -0,0 +1,68 @@
+import asyncio, time
+
+
+def loop_factory(use_uvloop: bool = False):
+    """
+    Returns an event-loop factory: the default asyncio loop, or uvloop's when
+    requested. uvloop is an optional dependency (`pip install uvloop`).
+    """
+    if not use_uvloop:
+        return asyncio.new_event_loop
+    try:
+        import uvloop
+    except ImportError as e:
+        raise RuntimeError("uvloop requested but not installed: pip install uvloop") from e
+    return uvloop.new_event_loop
+
+
+def run(coro, use_uvloop: bool = False):
+    """
+    asyncio.run on the chosen loop: on Ctrl-C or an error the main task is
+    cancelled, so its finally blocks (flushing sinks, closing the recorder) run.
+    """
+    with asyncio.Runner(loop_factory=loop_factory(use_uvloop)) as runner:
+        return runner.run(coro)
+
+
+async def _queue_roundtrip(n_msgs: int, n_producers: int) -> float:
+    """
+    Collector-shaped workload: several producer tasks (one per venue socket)
+    put small tuples on a shared queue, one consumer drains it. Returns
+    elapsed seconds; the cost is almost entirely loop scheduling.
+    """
+    q = asyncio.Queue(maxsize=1024)
+    per = n_msgs // n_producers
+
+    async def producer(i):
+        for k in range(per):
+            await q.put(("venue", i, k))
+            if k % 16 == 0:
+                await asyncio.sleep(0)   # sockets yield between frames
+
+    async def consumer():
+        for _ in range(per * n_producers):
+            await q.get()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(consumer(), *(producer(i) for i in range(n_producers)))
+    return time.perf_counter() - t0
+
+
+def benchmark(n_msgs: int = 200_000, n_producers: int = 2, repeats: int = 3) -> dict:
+    """
+    Times the queue workload on the default loop and, if installed, on uvloop.
+    Returns {loop: {"best_s", "us_per_msg", "msgs_per_s"}}.
+    """
+    out = {}
+    loops = ["asyncio"]
+    try:
+        import uvloop  # noqa: F401
+        loops.append("uvloop")
+    except ImportError:
+        print("uvloop not installed; benchmarking the default loop only")
+    for name in loops:
+        best = min(run(_queue_roundtrip(n_msgs, n_producers), use_uvloop=name == "uvloop")
+                   for _ in range(repeats))
+        n = (n_msgs // n_producers) * n_producers
+        out[name] = {"best_s": best, "us_per_msg": best / n * 1e6, "msgs_per_s": n / best}
+    return out
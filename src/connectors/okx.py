@@ -1,25 +1,39 @@
-import asyncio, json, time, websockets
+import json, time, websockets
 from src.core.book import OKXBook
+from src.connectors.supervisor import Supervisor
 
 WS = "wss://ws.okx.com:8443/ws/v5/public"
 
 def inst(symbol):
     return symbol.replace("USDT","-USDT")
 
-async def stream(queue, symbol="BTCUSDT"):
-    book = OKXBook(symbol)
-    sub = {"op":"subscribe", "args":[{"channel":"books5", "instId":inst(symbol)}]}
+async def stream(queue, symbols="BTCUSDT", supervisor: Supervisor | None = None):
+    symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+    # one socket, one subscribe carrying every instrument
+    books = {inst(s.upper()): OKXBook(s) for s in symbols}
+    sub = {"op":"subscribe", "args":[{"channel":"books5", "instId":i} for i in books]}
+    sup = supervisor or Supervisor("okx")
 
-    while True:
-        try:
-            async with websockets.connect(WS, ping_interval=20, max_size=2**20) as ws:
-                await ws.send(json.dumps(sub))
-                async for raw in ws:
-                    msg = json.loads(raw)
-                    if "arg" in msg and msg.get("data"):
-                        t_arrive = time.time_ns()
-                        snap = msg["data"][0]
-                        book.apply_snapshot(snap, t_arrive)
-                        await queue.put(("okx", symbol, book.view()))
-        except Exception:
-            await asyncio.sleep(0.5); continue
\ No newline at end of file
+    async def session(health):
+        async with websockets.connect(WS, ping_interval=20, max_size=2**20) as ws:
+            await ws.send(json.dumps(sub))
+            health.on_connect(time.time_ns())
+            async for raw in ws:
+                t_arrive = time.time_ns()
+                msg = json.loads(raw)
+                if msg.get("event") == "error":
+                    # e.g. a rejected instId; the socket stays open
+                    err = f"okx error {msg.get('code')}: {msg.get('msg')}"
+                    print(err)
+                    health.on_error(err)
+                    continue
+                if "arg" in msg and msg.get("data"):
+                    book = books[msg["arg"]["instId"]]
+                    health.on_message(t_arrive, book.symbol)
+                    snap = msg["data"][0]
+                    book.apply_snapshot(snap, t_arrive)
+                    await queue.put(("okx", book.symbol, book.view()))
+                else:
+                    health.on_message(t_arrive)
+
+    await sup.run(session)
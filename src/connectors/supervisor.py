@@ -0,0 +1,129 @@
+import asyncio, random, time
+from dataclasses import dataclass, field
+
+GAP_NS = 1_000_000_000   # a silence longer than this on a live socket counts as a gap
+
+
+class Backoff:
+    """
+    Jittered exponential backoff ("full jitter"): the n-th retry sleeps a
+    uniform random time in [0, min(cap, base * 2**n)], so reconnects of
+    many sockets don't synchronize against the venue.
+    """
+    def __init__(self, base: float = 0.1, cap: float = 30.0, rng: random.Random | None = None):
+        self.base = base
+        self.cap = cap
+        self.attempt = 0
+        self.rng = rng or random.Random()
+
+    def next(self) -> float:
+        """Returns the next delay in seconds and advances the attempt counter."""
+        delay = self.rng.uniform(0.0, min(self.cap, self.base * 2 ** self.attempt))
+        self.attempt += 1
+        return delay
+
+    def reset(self):
+        self.attempt = 0
+
+
+@dataclass
+class FeedHealth:
+    """
+    Reconnect, gap and staleness metrics for one supervised connection.
+    All timestamps are time.time_ns().
+    """
+    name: str
+    gap_ns: int = GAP_NS
+    connects: int = 0
+    reconnects: int = 0
+    errors: int = 0
+    last_error: str | None = None
+    msgs: int = 0
+    gaps: int = 0
+    max_gap_ns: int = 0
+    downtime_ns: int = 0
+    last_msg_ns: int = 0
+    down_since_ns: int | None = field(default=None)
+    # symbols share a socket, so staleness is also tracked per symbol
+    symbol_last_msg_ns: dict[str, int] = field(default_factory=dict)
+
+    def on_connect(self, t_ns: int):
+        if self.connects:
+            self.reconnects += 1
+        self.connects += 1
+        if self.down_since_ns is not None:
+            self.downtime_ns += t_ns - self.down_since_ns
+            self.down_since_ns = None
+
+    def on_message(self, t_ns: int, symbol: str | None = None):
+        if symbol is not None:
+            self.symbol_last_msg_ns[symbol] = t_ns
+        if self.last_msg_ns:
+            dt = t_ns - self.last_msg_ns
+            if dt > self.gap_ns:
+                self.gaps += 1
+            if dt > self.max_gap_ns:
+                self.max_gap_ns = dt
+        self.last_msg_ns = t_ns
+        self.msgs += 1
+
+    def on_error(self, message: str):
+        """An error reported by the venue on a socket that stays open."""
+        self.errors += 1
+        self.last_error = message
+
+    def on_disconnect(self, t_ns: int, error: BaseException | None = None):
+        if error is not None:
+            self.errors += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+        if self.down_since_ns is None:
+            self.down_since_ns = t_ns
+
+    def staleness_ns(self, now_ns: int) -> int | None:
+        """Time since the last message, or None if nothing has arrived yet."""
+        return now_ns - self.last_msg_ns if self.last_msg_ns else None
+
+    def snapshot(self, now_ns: int | None = None) -> dict:
+        now_ns = now_ns or time.time_ns()
+        down = self.downtime_ns
+        if self.down_since_ns is not None:
+            down += now_ns - self.down_since_ns
+        return {"feed": self.name, "connected": self.down_since_ns is None and self.connects > 0,
+                "connects": self.connects, "reconnects": self.reconnects,
+                "errors": self.errors, "last_error": self.last_error,
+                "msgs": self.msgs, "gaps": self.gaps, "max_gap_ns": self.max_gap_ns,
+                "downtime_ns": down, "staleness_ns": self.staleness_ns(now_ns),
+                "symbols": {s: {"last_msg_ns": t, "staleness_ns": now_ns - t}
+                            for s, t in self.symbol_last_msg_ns.items()}}
+
+
+class Supervisor:
+    """
+    Keeps one websocket session alive. `session(health)` opens the socket,
+    reports into `health` and returns/raises when the socket dies; the
+    supervisor logs the error and reconnects after a jittered backoff.
+    The backoff resets once a session has delivered at least one message.
+    """
+    def __init__(self, name: str, backoff: Backoff | None = None, gap_ns: int = GAP_NS):
+        self.name = name
+        self.backoff = backoff or Backoff()
+        self.health = FeedHealth(name, gap_ns=gap_ns)
+
+    async def run(self, session):
+        while True:
+            msgs_before = self.health.msgs
+            error = None
+            try:
+                await session(self.health)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+            self.health.on_disconnect(time.time_ns(), error)
+            if self.health.msgs > msgs_before:
+                self.backoff.reset()
+            delay = self.backoff.next()
+            reason = f"error: {self.health.last_error}" if error else "connection closed"
+            print(f"{self.name} connector {reason}. Reconnecting in {delay:.2f}s "
+                  f"(attempt {self.backoff.attempt})")
+            await asyncio.sleep(delay)
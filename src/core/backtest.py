@@ -1,90 +1,169 @@
-import json, pathlib, math, pandas as pd
-from src.core.reader import load_jsonl
+import heapq, json, os, pathlib, math, pickle, tempfile, pandas as pd
+from src.core.reader import COLUMNS, load_jsonl, read_from
 from src.core.fair_price import FairPriceEngine, STALE_NS
 from src.core.init_config import MMConfig
 import random
 
 class BackTester:
-    def __init__(self, data_path: str, symbol: str, cfg: MMConfig, fill_mode: str ="deterministic"):
-        self.df     = load_jsonl(data_path)
+    def __init__(self, data_path: str | pd.DataFrame, symbol: str, cfg: MMConfig, fill_mode: str ="deterministic",
+                 seed: int | None = None, risk=None):
+        """
+        risk: optional portfolio.PortfolioRisk shared by the testers of several
+        symbols; fills then move the other symbols' quotes via cross skew.
+        Replay shared-risk testers with run_portfolio, which interleaves their
+        ticks in time order; run() on each in turn would let later symbols see
+        the earlier ones' end-of-tape inventory.
+        """
+        # an already loaded tape (e.g. a slice reused across many configs) skips the parse
+        self.df     = data_path if isinstance(data_path, pd.DataFrame) else load_jsonl(data_path)
         self.df     = self.df[self.df.symbol == symbol].sort_values("t_arrive_ns")
-        self.eng    = FairPriceEngine(cfg)
+        self.eng    = FairPriceEngine(cfg, risk)
         self.symbol = symbol
         self.cash    = 0.0
-        self.inv    = 0.0
         self.last_mid = None
         self.last_q = None
         self.next_q_time = 0
+        self.prev_ts = None
         self.trades = 0
 
         self.fill_mode = fill_mode
         self.lmbda0 = 2.0
         self.alpha = 4.0
+        self.seed = seed
+        self.rng = random.Random(seed)
 
-    def deterministic_fill(self, row):
-        if row.mid >= self.last_q["ask"]:               # we sell 1
-            self.cash += self.last_q["ask"]
-            self.inv  -= 1
-            self.trades += 1
-        elif row.mid <= self.last_q["bid"]:             # we buy 1
-            self.cash -= self.last_q["bid"]
-            self.inv  += 1
-            self.trades += 1
-    def poisson_fill(self, row, dt: float):
-        best_bid = row.bid
-        best_ask = row.ask
+        # incremental mode (see follow/update): tape being tailed and bytes consumed
+        self.path = None
+        self.offset = 0
 
+    @classmethod
+    def follow(cls, path: str, symbol: str, cfg: MMConfig, fill_mode: str = "deterministic",
+               seed: int | None = None, risk=None) -> "BackTester":
+        """A tester over a growing tape that replays nothing until update() is called."""
+        bt = cls(pd.DataFrame(columns=COLUMNS), symbol, cfg, fill_mode, seed, risk)
+        bt.path = path
+        return bt
+
+    @property
+    def inv(self) -> float:
+        # fills go through the engine's inventory so kappa and cross skew see them
+        return self.eng.inv.get(self.symbol)
+
+    def fill(self, side: int, price: float):
+        """side=+1: our ask was lifted (sold 1), side=-1: our bid was hit (bought 1)."""
+        self.cash += side * price
+        self.eng.inv.update(self.symbol, 1, side)
+        self.trades += 1
+
+    def deterministic_fill(self, mid: float):
+        if mid >= self.last_q["ask"]:               # we sell 1
+            self.fill(+1, self.last_q["ask"])
+        elif mid <= self.last_q["bid"]:             # we buy 1
+            self.fill(-1, self.last_q["bid"])
+    def poisson_fill(self, best_bid: float, best_ask: float, dt: float):
         dist_bid_ticks = max(0.0, (best_bid - self.last_q["bid"]) / 0.01)  # assume 0.01 tick
         pbuy = self.poisson_prob(dist_bid_ticks, dt)
-        if random.random() < pbuy:                    # got hit, we buy
-            self.cash -= self.last_q["bid"]
-            self.inv  += 1
-            self.trades += 1
+        if self.rng.random() < pbuy:                  # got hit, we buy
+            self.fill(-1, self.last_q["bid"])
 
         dist_ask_ticks = max(0.0, (self.last_q["ask"] - best_ask) / 0.01)
         psell = self.poisson_prob(dist_ask_ticks, dt)
-        if random.random() < psell:                   # got lifted, we sell
-            self.cash += self.last_q["ask"]
-            self.inv  -= 1
-            self.trades += 1
+        if self.rng.random() < psell:                 # got lifted, we sell
+            self.fill(+1, self.last_q["ask"])
 
     def poisson_prob(self, dist_ticks: float, dt: float) -> float:
         rate = self.lmbda0 * math.exp(-self.alpha * dist_ticks)
         return 1.0 - math.exp(-rate * dt)
-    
-    def run(self):
-        prev_ts = None
-        for _, row in self.df.iterrows():
-            ts = int(row.t_arrive_ns)
-            mid = float(row.mid)
-            self.last_mid = mid
-            snap = {
-                "symbol": row.symbol,
-                "mid"   : mid,
-                "bid"   : row.bid,
-                "ask"   : row.ask,
-                "bids5" : [], "asks5": [],
-                "t_arrive_ns": ts,
-            }
-            self.eng.update(row.venue, row.symbol, snap)
-
-            if ts >= self.next_q_time:
-                self.last_q = self.eng.quote(self.symbol)
-                self.next_q_time = ts + 100_000_000  # 100 ms
-
-                
-
-            if not self.last_q:
-                prev_ts = ts
-                continue
-
-            if self.fill_mode == "deterministic":
-                self.deterministic_fill(row)
-            else:
-                dt = 0 if prev_ts is None else (ts - prev_ts) / 1e9
-                self.poisson_fill(row,dt)
-            prev_ts = ts
-        m2m_pnl = self.cash + self.inv * self.last_mid
+
+    def step(self, ts: int, venue: str, mid: float, bid: float, ask: float):
+        """Replays one tick of self.symbol: engine update, 100ms quote timer, fills."""
+        self.last_mid = mid
+        snap = {
+            "symbol": self.symbol,
+            "mid"   : mid,
+            "bid"   : bid,
+            "ask"   : ask,
+            "bids5" : [], "asks5": [],
+            "t_arrive_ns": ts,
+        }
+        self.eng.update(venue, self.symbol, snap)
+
+        if ts >= self.next_q_time:
+            self.last_q = self.eng.quote(self.symbol)
+            self.next_q_time = ts + 100_000_000  # 100 ms
+
+        if not self.last_q:
+            self.prev_ts = ts
+            return
+
+        if self.fill_mode == "deterministic":
+            self.deterministic_fill(mid)
+        else:
+            dt = 0 if self.prev_ts is None else (ts - self.prev_ts) / 1e9
+            self.poisson_fill(bid, ask, dt)
+        self.prev_ts = ts
+
+    def result(self) -> dict:
+        m2m_pnl = self.cash + self.inv * self.last_mid if self.last_mid is not None else self.cash
         return {"pnl": m2m_pnl, "cash": self.cash, "inv": self.inv, "trades": self.trades}
-        
-        
\ No newline at end of file
+
+    def run(self):
+        for row in self.df.itertuples(index=False):
+            self.step(int(row.t_arrive_ns), row.venue, float(row.mid), float(row.bid), float(row.ask))
+        return self.result()
+
+    def update(self) -> dict:
+        """
+        Replays only the rows appended to the followed tape since the last
+        update and returns the running result. Each batch is sorted by
+        t_arrive_ns; rows are never re-read, so cost is O(new ticks).
+        """
+        rows, self.offset = read_from(self.path, self.offset)
+        rows = sorted((r for r in rows if r["symbol"] == self.symbol), key=lambda r: r["t_arrive_ns"])
+        for r in rows:
+            self.step(int(r["t_arrive_ns"]), r["venue"], float(r["mid"]), float(r["bid"]), float(r["ask"]))
+        return self.result()
+
+    def __getstate__(self):
+        # everything except the loaded tape: engine filters, cash/inv, quote
+        # timer, RNG state and the byte offset into the followed file
+        state = self.__dict__.copy()
+        state["df"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.df = pd.DataFrame(columns=COLUMNS)
+
+    def save(self, path: str):
+        """Writes a temp file beside `path` and renames it over, so a killed save leaves the old state."""
+        data = pickle.dumps(self)
+        fd, tmp = tempfile.mkstemp(dir=pathlib.Path(path).resolve().parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "BackTester":
+        return pickle.loads(pathlib.Path(path).read_bytes())
+
+
+def run_portfolio(testers: list[BackTester]) -> dict[str, dict]:
+    """
+    Replays several testers (typically one per symbol, sharing a PortfolioRisk)
+    with their tapes merged by t_arrive_ns, so each fill and covariance sample
+    only sees what had happened by then. Returns {symbol: result}.
+    """
+    def ticks(i, bt):
+        for row in bt.df.itertuples(index=False):
+            yield int(row.t_arrive_ns), i, row
+
+    for ts, i, row in heapq.merge(*(ticks(i, bt) for i, bt in enumerate(testers))):
+        testers[i].step(ts, row.venue, float(row.mid), float(row.bid), float(row.ask))
+    return {bt.symbol: bt.result() for bt in testers}
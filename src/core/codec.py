@@ -0,0 +1,20 @@
+"""
+One wire/tape encoding for everything that serializes quotes and books:
+compact JSON as bytes, via orjson when installed (several times faster than
+the stdlib) and json otherwise. The Recorder and the quote publishers both
+go through dumps(), so a quote line is encoded once and shared.
+"""
+try:
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",",":")).encode()
+
+    loads = json.loads
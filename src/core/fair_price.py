@@ -14,33 +14,49 @@ class FairPriceEngine:
     Maintains the latest per venue snapshots from book classes, produces
     latency adjusted fair mid to favor recent information and bid asks
     """
-    def __init__(self, config: MMConfig):
+    def __init__(self, config: MMConfig, risk=None, symbol_configs: dict[str, MMConfig] | None = None):
+        """
+        Args:
+            config: Filter, spread and skew parameters.
+            risk: Optional portfolio.PortfolioRisk; when given it holds the
+                  inventories and adds a cross-asset skew to every quote.
+            symbol_configs: Optional per-symbol overrides of `config`, e.g.
+                  each calibrated on its own symbol's tape.
+        """
         self.config = config
-        self.books: dict[str, dict] = {}
+        self.symbol_configs = symbol_configs or {}
+        # symbol -> venue -> latest book view
+        self.books: dict[str, dict[str, dict]] = {}
         self.kf: dict[str, Kalman1D]= {}
-        self.inv = InventoryManager()
+        self.risk = risk
+        self.inv = risk if risk is not None else InventoryManager()
         self.vol: dict[str, EWMA] = {}
         self.last_fair_values: dict[str, float] = {}
         self._sim_ts_ns = None
+    def cfg(self, symbol: str) -> MMConfig:
+        return self.symbol_configs.get(symbol, self.config)
+
     def create(self, symbol: str):
         if symbol not in self.kf:
-            self.kf[symbol] = Kalman1D(q_process=self.config.q_process)
-            self.vol[symbol] = EWMA(halflife_s= self.config.vol_halflife_s)
+            cfg = self.cfg(symbol)
+            self.kf[symbol] = Kalman1D(q_process=cfg.q_process)
+            self.vol[symbol] = EWMA(halflife_s= cfg.vol_halflife_s)
+            self.books[symbol] = {}
             print(f"Initialized filters for {symbol}")
     
     def update(self, venue: str, symbol: str, snapshot: dict):
         """ Whenever a new book.view arrives call this to update"""
         self.create(symbol)
-        self.books[venue] = snapshot
+        self.books[symbol][venue] = snapshot
         self._sim_ts_ns = snapshot["t_arrive_ns"]
 
 
     def quote(self, symbol: str):
         """logic for fair mid adjusted for latency and bid and ask, returns none if no fresh venues"""
         now = getattr(self, "_sim_ts_ns", time.time_ns())
-        
-        #something for config, idk and ifx the bottom
-        fresh = [(v, b) for v, b in self.books.items() if b["symbol"] == symbol and (now - b["t_arrive_ns"]) <= STALE_NS]
+        cfg = self.cfg(symbol)
+
+        fresh = [(v, b) for v, b in self.books.get(symbol, {}).items() if (now - b["t_arrive_ns"]) <= STALE_NS]
         
         if not fresh:
             return None
@@ -53,9 +69,9 @@ class FairPriceEngine:
             w = 1.0 / (age + EPS)
             spread = b["ask"] - b["bid"]
             R = (
-                self.config.r0 +
-                self.config.r1 * w +
-                self.config.r2 * spread**2
+                cfg.r0 +
+                cfg.r1 * w +
+                cfg.r2 * spread**2
             )
             meas.append((b["mid"], R))
             weights.append(w); mids.append(b["mid"]); venues.append(v)
@@ -70,21 +86,25 @@ class FairPriceEngine:
         
         if prev and prev > 0 and fair > 0:
             r2   = math.log(fair / prev) ** 2
-            sig2 = self.vol[symbol].update(r2 * self.config.ann_factor)
+            sig2 = self.vol[symbol].update(r2 * cfg.ann_factor)
             sigma = math.sqrt(sig2)
         self.last_fair_values[symbol] = fair
 
         avg_imb = sum(imbs) / len(imbs)
 
-        h_unc = self.config.a_unc * math.sqrt(P + sigma**2 * self.config.h_secs)
-        h_imp = self.config.b_impact * abs(avg_imb)
+        h_unc = cfg.a_unc * math.sqrt(P + sigma**2 * cfg.h_secs)
+        h_imp = cfg.b_impact * abs(avg_imb)
 
         half  = min(
-            max(h_unc + h_imp, self.config.min_half),
-            self.config.max_half
+            max(h_unc + h_imp, cfg.min_half),
+            cfg.max_half
         )
         inv      = self.inv.get(symbol)
-        mid_star = fair - self.config.kappa * inv
+        xskew    = 0.0
+        if self.risk is not None:
+            self.risk.on_fair(symbol, fair, now)
+            xskew = self.risk.skew(symbol)
+        mid_star = fair - cfg.kappa * inv - xskew
 
         return {
             "t_ns": now,
@@ -94,6 +114,7 @@ class FairPriceEngine:
             "bid": mid_star - half,
             "ask": mid_star + half,
             "inv": inv,
+            "xskew": xskew,
             "imbalance": avg_imb,
             "sigma": sigma,
             "venues_used": venues,
@@ -0,0 +1,174 @@
+import dataclasses
+import math
+import random
+from dataclasses import dataclass
+import pandas as pd
+from src.core.backtest import BackTester
+from src.core.init_config import MMConfig
+
+
+@dataclass
+class Param:
+    """Search range for one MMConfig field; log=True samples uniformly in log space."""
+    low: float
+    high: float
+    log: bool = False
+
+    def from_unit(self, u: float) -> float:
+        if self.log:
+            return math.exp(math.log(self.low) + u * (math.log(self.high) - math.log(self.low)))
+        return self.low + u * (self.high - self.low)
+
+    def to_unit(self, x: float) -> float:
+        if self.log:
+            return (math.log(x) - math.log(self.low)) / (math.log(self.high) - math.log(self.low))
+        return (x - self.low) / (self.high - self.low)
+
+
+def default_space(base: MMConfig) -> dict[str, Param]:
+    """
+    Ranges for every tunable MMConfig field, centred on the calibrated base config
+    (ann_factor is a unit conversion, not a knob, so it stays fixed).
+    """
+    def around(v: float, f: float = 10.0) -> Param:
+        v = abs(v) or 1e-12
+        return Param(v / f, v * f, log=True)
+    k = abs(base.kappa) or base.min_half
+    return {
+        "q_process":      around(base.q_process),
+        "r0":             around(base.r0),
+        "r1":             around(base.r1),
+        "r2":             Param(0.01, 1.0, log=True),
+        "vol_halflife_s": Param(5.0, 600.0, log=True),
+        "h_secs":         Param(0.25, 10.0, log=True),
+        "a_unc":          Param(0.05, 1.0),
+        "b_impact":       Param(0.0, 0.2),
+        "kappa":          Param(-5 * k, 5 * k),
+        "min_half":       around(base.min_half, 4.0),
+        "max_half":       around(base.max_half, 4.0),
+    }
+
+
+def successive_halving(candidates: list[dict], evaluate, min_frac: float, eta: int = 3) -> list[dict]:
+    """
+    Scores every candidate on the first `min_frac` of the tape, keeps the best
+    1/eta, multiplies the tape fraction by eta and repeats until the survivors
+    have been replayed on the full tape.
+
+    Args:
+        candidates: parameter dicts.
+        evaluate: evaluate(params, frac) -> score, higher is better.
+
+    Returns:
+        One {"params", "frac", "rung", "score"} record per evaluation.
+    """
+    history = []
+    alive, frac, rung = list(candidates), min_frac, 0
+    while alive:
+        scored = []
+        for p in alive:
+            score = evaluate(p, frac)
+            scored.append((score, p))
+            history.append({"params": p, "frac": frac, "rung": rung, "score": score})
+        if frac >= 1.0:
+            break
+        scored.sort(key=lambda sp: sp[0], reverse=True)
+        alive = [p for _, p in scored[:max(1, len(scored) // eta)]]
+        frac, rung = frac * eta, rung + 1
+        if frac > 1.0 - 1e-9:
+            frac = 1.0
+    return history
+
+
+class Tuner:
+    """
+    Tunes MMConfig on one tape with successive halving: many random configs are
+    replayed on short leading slices of the tape and only the best are promoted
+    to longer replays. With surrogate=True, later rounds draw their candidates
+    from a Gaussian-process model (sklearn) fitted on every config scored so far.
+    """
+    def __init__(self, df: pd.DataFrame, symbol: str, base: MMConfig,
+                 space: dict[str, Param] | None = None, fill_mode: str = "deterministic",
+                 eta: int = 3, min_frac: float = 1 / 27, surrogate: bool = False, seed: int = 0):
+        self.df = df[df.symbol == symbol].sort_values("t_arrive_ns")
+        self.symbol = symbol
+        self.base = base
+        self.space = space or default_space(base)
+        self.fill_mode = fill_mode
+        self.eta = eta
+        self.min_frac = min_frac
+        self.surrogate = surrogate
+        self.rng = random.Random(seed)
+        # every replay draws the same poisson fills (common random numbers), so
+        # candidates are ranked on their quotes rather than on fill luck
+        self.replay_seed = seed
+        self.history: list[dict] = []
+        self._slices: dict[float, pd.DataFrame] = {}
+
+    def make_cfg(self, params: dict) -> MMConfig:
+        cfg = dataclasses.replace(self.base, **params)
+        cfg.max_half = max(cfg.max_half, cfg.min_half)
+        return cfg
+
+    def tape(self, frac: float) -> pd.DataFrame:
+        """The first `frac` of the tape by time (cached, shared by all configs)."""
+        if frac not in self._slices:
+            t = self.df.t_arrive_ns
+            t_end = t.iloc[0] + frac * (t.iloc[-1] - t.iloc[0])
+            self._slices[frac] = self.df if frac >= 1.0 else self.df[t <= t_end]
+        return self._slices[frac]
+
+    def evaluate(self, params: dict, frac: float) -> float:
+        return BackTester(self.tape(frac), self.symbol, self.make_cfg(params), self.fill_mode,
+                          self.replay_seed).run()["pnl"]
+
+    def _random(self) -> dict:
+        return {k: p.from_unit(self.rng.random()) for k, p in self.space.items()}
+
+    def propose(self, n: int) -> list[dict]:
+        """Random candidates, or surrogate UCB picks once there is history to fit."""
+        if not self.surrogate or len(self.history) < 2 * len(self.space):
+            return [self._random() for _ in range(n)]
+        import numpy as np
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import Matern, WhiteKernel
+
+        # each config's deepest replay, scored as pnl per unit of tape so budgets compare
+        deepest = {}
+        for h in self.history:
+            key = tuple(h["params"].values())
+            if key not in deepest or h["frac"] > deepest[key]["frac"]:
+                deepest[key] = h
+        names = list(self.space)
+        X = np.array([[self.space[k].to_unit(h["params"][k]) for k in names] for h in deepest.values()])
+        y = np.array([h["score"] / h["frac"] for h in deepest.values()])
+        gp = GaussianProcessRegressor(Matern(nu=2.5) + WhiteKernel(), normalize_y=True,
+                                      random_state=self.rng.randrange(2**31))
+        gp.fit(X, y)
+
+        # keep a third of every round random so the model can't lock onto one basin
+        n_model = n - n // 3
+        pool = np.array([[self.rng.random() for _ in names] for _ in range(50 * n)])
+        mu, sd = gp.predict(pool, return_std=True)
+        best = np.argsort(-(mu + 1.0 * sd))[:n_model]
+        picks = [{k: self.space[k].from_unit(float(u)) for k, u in zip(names, pool[i])} for i in best]
+        return picks + [self._random() for _ in range(n - n_model)]
+
+    def run(self, n_candidates: int = 81, rounds: int = 1):
+        """
+        Runs `rounds` successive-halving brackets of `n_candidates` each.
+        Returns (best config, history DataFrame).
+        """
+        for r in range(rounds):
+            hist = successive_halving(self.propose(n_candidates), self.evaluate, self.min_frac, self.eta)
+            for h in hist:
+                h["round"] = r
+            self.history += hist
+            full = [h for h in hist if h["frac"] >= 1.0]
+            print(f"round {r}: {len(hist)} replays, best full-tape pnl "
+                  f"{max(h['score'] for h in full):.4f}")
+        full = [h for h in self.history if h["frac"] >= 1.0]
+        best = max(full, key=lambda h: h["score"])
+        rows = [{"round": h["round"], "rung": h["rung"], "frac": h["frac"], "score": h["score"], **h["params"]}
+                for h in self.history]
+        return self.make_cfg(best["params"]), pd.DataFrame(rows)
@@ -0,0 +1,101 @@
+import math
+import numpy as np
+
+
+class PortfolioRisk:
+    """
+    Vectorized inventory risk across many correlated symbols.
+
+    Holds inventories in one array and keeps an EWMA covariance matrix of
+    fair-value log returns sampled every `sample_s`, updated in place with a
+    rank-1 step per sample (cov <- (1-a) cov + a r r^T) instead of being
+    recomputed from history. For each quote it gives the cross-asset skew
+    (Avellaneda-Stoikov reservation shift from the *other* positions):
+
+        skew_i = gamma * p_i * sum_{j != i} cov_ij * p_j * q_j
+
+    The own-inventory term stays with the engine's kappa. Also exposes the
+    InventoryManager get/update API so it can back FairPriceEngine.inv.
+    """
+    def __init__(self, gamma: float, halflife_s: float = 60.0, sample_s: float = 1.0,
+                 symbols: list[str] | tuple = ()):
+        """
+        Args:
+            gamma: Risk aversion, scales the skew (0 disables it).
+            halflife_s: Half-life of the covariance EWMA in seconds.
+            sample_s: Return sampling interval; cov is per-interval variance.
+        """
+        self.gamma = gamma
+        self.sample_ns = int(sample_s * 1e9)
+        self.alpha = 1.0 - math.exp(math.log(0.5) / max(halflife_s / sample_s, 1e-9))
+        self.index: dict[str, int] = {}
+        self.inv = np.zeros(0)
+        self.price = np.zeros(0)
+        self.last_price = np.zeros(0)
+        self.cov = np.zeros((0, 0))
+        self.n_samples = 0
+        self.next_sample_ns: int | None = None
+        for s in symbols:
+            self.add(s)
+
+    def add(self, symbol: str) -> int:
+        """Registers a symbol (growing the arrays) and returns its index."""
+        i = self.index.get(symbol)
+        if i is not None:
+            return i
+        i = self.index[symbol] = len(self.index)
+        n = i + 1
+        self.inv = np.append(self.inv, 0.0)
+        self.price = np.append(self.price, np.nan)
+        self.last_price = np.append(self.last_price, np.nan)
+        cov = np.zeros((n, n))
+        cov[:i, :i] = self.cov
+        self.cov = cov
+        return i
+
+    def get(self, symbol: str) -> float:
+        """Gets the current inventory for a symbol."""
+        i = self.index.get(symbol)
+        return 0.0 if i is None else float(self.inv[i])
+
+    def update(self, symbol: str, quantity: float, side: int):
+        """Same convention as InventoryManager.update: side=+1 sold, side=-1 bought."""
+        self.inv[self.add(symbol)] -= side * quantity
+
+    def on_fair(self, symbol: str, fair: float, t_ns: int):
+        """
+        Records a new fair value. When a sample is due it is taken first, so
+        every symbol's return is measured on the same grid point (the prices
+        just before this tick) rather than mixing this tick with stale ones.
+        """
+        i = self.add(symbol)
+        if self.next_sample_ns is None:
+            self.next_sample_ns = t_ns + self.sample_ns
+        elif t_ns >= self.next_sample_ns:
+            self._sample()
+            self.next_sample_ns = t_ns + self.sample_ns
+        self.price[i] = fair
+
+    def _sample(self):
+        ok = (self.price > 0) & (self.last_price > 0)
+        if ok.any():
+            r = np.zeros_like(self.price)
+            np.log(self.price, out=r, where=ok)
+            r[ok] -= np.log(self.last_price[ok])
+            # rank-1 EWMA update, in place
+            self.cov *= 1.0 - self.alpha
+            self.cov += self.alpha * np.outer(r, r)
+            self.n_samples += 1
+        np.copyto(self.last_price, self.price)
+
+    def skew(self, symbol: str, cross_only: bool = True) -> float:
+        """Price shift to subtract from the quote centre of `symbol`; O(n symbols)."""
+        i = self.index.get(symbol)
+        if i is None or not self.gamma:
+            return 0.0
+        dollar = np.nan_to_num(self.price) * self.inv
+        row = self.cov[i]
+        exposure = row @ dollar
+        if cross_only:
+            exposure -= row[i] * dollar[i]
+        return float(self.gamma * self.price[i] * exposure)
@@ -0,0 +1,234 @@
+import collections
+import fnmatch
+import gc
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+
+# allocation sites of the profiler itself and of the stdlib helpers it calls
+_OWN_SITES = (__file__, tracemalloc.__file__, fnmatch.__file__,
+              os.path.dirname(re.__file__) + os.sep, "<frozen importlib._bootstrap")
+
+
+def _site(frame: tracemalloc.Frame) -> str | None:
+    return None if frame.filename.startswith(_OWN_SITES) else str(frame)
+
+
+def _pct(values, q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))]
+
+
+def rss_bytes() -> int:
+    """Current resident set size (Linux /proc), else peak RSS from getrusage."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource, sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class GCMonitor:
+    """
+    Times every garbage collection through gc.callbacks: count, total and max
+    pause per generation, plus the most recent pauses for percentiles.
+    """
+    def __init__(self, keep: int = 10_000):
+        self.counts = [0, 0, 0]
+        self.total_ns = [0, 0, 0]
+        self.max_ns = [0, 0, 0]
+        self.collected = [0, 0, 0]
+        self.pauses = collections.deque(maxlen=keep)
+        self._t0 = 0
+
+    def _callback(self, phase: str, info: dict):
+        if phase == "start":
+            self._t0 = time.perf_counter_ns()
+            return
+        dt = time.perf_counter_ns() - self._t0
+        g = info["generation"]
+        self.counts[g] += 1
+        self.total_ns[g] += dt
+        self.max_ns[g] = max(self.max_ns[g], dt)
+        self.collected[g] += info["collected"]
+        self.pauses.append(dt)
+
+    def start(self):
+        gc.callbacks.append(self._callback)
+
+    def stop(self):
+        if self._callback in gc.callbacks:
+            gc.callbacks.remove(self._callback)
+
+    def snapshot(self) -> dict:
+        return {"gen": [{"count": c, "total_ms": t / 1e6, "max_ms": m / 1e6, "collected": k}
+                        for c, t, m, k in zip(self.counts, self.total_ns, self.max_ns, self.collected)],
+                "pause_p50_us": _pct(self.pauses, 0.50) / 1e3,
+                "pause_p99_us": _pct(self.pauses, 0.99) / 1e3}
+
+
+class CollectorProfiler:
+    """
+    Profiling mode for the collector. Per reporting window it measures:
+      - per-event processing latency (p50/p99/max),
+      - GC pauses and counts per generation (cumulative),
+      - RSS, so growth over time shows up across windows,
+      - with alloc=True, tracemalloc blocks/bytes per event by call site.
+    A window-to-window snapshot diff only sees blocks still alive, so
+    `alloc_sites` is what each event leaves behind (growth into the engine's
+    state). Short-lived temporaries are counted by tracing one event in
+    every `churn_every` (trace_event): a snapshot at each function return
+    inside the event, while the returning frame's locals are still alive,
+    gives per site the most blocks live at once -> `alloc_churn`.
+    tracemalloc hooks every allocation and inflates the latency and GC
+    figures, so compare those against --gc-tune with alloc=False.
+    """
+    def __init__(self, alloc: bool = True, nframes: int = 1, top: int = 10, keep: int = 100_000,
+                 churn_every: int = 1_000):
+        self.gc = GCMonitor()
+        self.alloc = alloc
+        self.nframes = nframes
+        self.top = top
+        self.churn_every = churn_every
+        self.latency_ns = collections.deque(maxlen=keep)
+        self.events = 0
+        self.rss_series: list[tuple[int, int]] = []
+        self._window_events = 0
+        self._alloc_events = 0    # events since the retained-sites baseline
+        self._snap = None
+        self._calls = 0
+        self._churn: dict[str, list[int]] = {}   # site -> [blocks, bytes] summed over traced events
+        self._churn_events = 0
+
+    def start(self):
+        self.gc.start()
+        if self.alloc:
+            tracemalloc.start(self.nframes)
+            self._snap = tracemalloc.take_snapshot()
+        self.rss_series.append((time.time_ns(), rss_bytes()))
+
+    def stop(self):
+        self.gc.stop()
+        if self.alloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def on_event(self, elapsed_ns: int):
+        self.events += 1
+        self._window_events += 1
+        self._alloc_events += 1
+        self.latency_ns.append(elapsed_ns)
+
+    def churn_due(self) -> bool:
+        """True for one event in every churn_every; run that one through trace_event."""
+        self._calls += 1
+        return self.alloc and self.churn_every > 0 and self._calls % self.churn_every == 0
+
+    def trace_event(self, fn, *args):
+        """
+        Runs fn(*args) under a profile hook that snapshots tracemalloc at every
+        Python function return and keeps, per call site, the most blocks and
+        bytes live at once. Traces are cleared first, so each snapshot only
+        walks this event's own blocks, however large the heap is; the
+        retained-sites window restarts after it. The hook still makes the
+        event slower, so it is not added to the latency figures.
+        """
+        tracemalloc.clear_traces()
+        peak: dict[str, list[int]] = {}
+
+        def hook(frame, event, arg):
+            if event != "return":
+                return
+            for st in tracemalloc.take_snapshot().statistics("lineno"):
+                site = _site(st.traceback[0])
+                if site is not None:
+                    top = peak.setdefault(site, [0, 0])
+                    top[0] = max(top[0], st.count)
+                    top[1] = max(top[1], st.size)
+
+        sys.setprofile(hook)
+        try:
+            return fn(*args)
+        finally:
+            sys.setprofile(None)
+            self.events += 1
+            self._churn_events += 1
+            for site, (blocks, size) in peak.items():
+                tot = self._churn.setdefault(site, [0, 0])
+                tot[0] += blocks
+                tot[1] += size
+            self._snap = tracemalloc.take_snapshot()
+            self._alloc_events = 0
+
+    def _alloc_churn(self) -> list[dict]:
+        n = self._churn_events
+        top = sorted(self._churn.items(), key=lambda kv: kv[1][1], reverse=True)[:self.top]
+        self._churn, self._churn_events = {}, 0
+        return [{"site": site, "blocks_per_event": blocks / n, "bytes_per_event": size / n}
+                for site, (blocks, size) in top]
+
+    def _alloc_sites(self, n_events: int) -> tuple[list[dict], float]:
+        snap = tracemalloc.take_snapshot()
+        stats = snap.compare_to(self._snap, "lineno")
+        self._snap = snap
+        self._alloc_events = 0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        sites = [{"site": site,
+                  "blocks_per_event": s.count_diff / n_events,
+                  "bytes_per_event": s.size_diff / n_events}
+                 for s in stats if (s.count_diff or s.size_diff)
+                 and (site := _site(s.traceback[0])) is not None]
+        return sites[:self.top], peak / 1024
+
+    def report(self) -> dict:
+        """Metrics for the window since the last report."""
+        now = time.time_ns()
+        rss = rss_bytes()
+        self.rss_series.append((now, rss))
+        lat = list(self.latency_ns)[-self._window_events:] if self._window_events else []
+        out = {"feed": "profile", "events": self.events, "window_events": self._window_events,
+               "event_p50_us": _pct(lat, 0.50) / 1e3, "event_p99_us": _pct(lat, 0.99) / 1e3,
+               "event_max_us": max(lat, default=0) / 1e3,
+               "gc": self.gc.snapshot(), "gc_thresholds": gc.get_threshold(),
+               "gc_frozen": gc.get_freeze_count(),
+               "rss_mb": rss / 2**20,
+               "rss_growth_mb": (rss - self.rss_series[0][1]) / 2**20}
+        if self.alloc and self._alloc_events:
+            out["alloc_sites"], out["alloc_peak_kb"] = self._alloc_sites(self._alloc_events)
+        if self._churn_events:
+            out["churn_events"] = self._churn_events
+            out["alloc_churn"] = self._alloc_churn()
+        self._window_events = 0
+        return out
+
+
+class GCPolicy:
+    """
+    Tuned GC for the collector: larger thresholds so gen0 collections (and the
+    gen1/gen2 cascades behind them) run less often, and after `warmup_events`
+    one full collection followed by gc.freeze(), which moves every object that
+    survived warm-up (imports, books, filters) out of future collections.
+    """
+    def __init__(self, thresholds: tuple[int, int, int] = (50_000, 50, 100), warmup_events: int = 2_000):
+        self.thresholds = thresholds
+        self.warmup_events = warmup_events
+        self.events = 0
+        self.frozen = False
+
+    def start(self):
+        gc.set_threshold(*self.thresholds)
+
+    def on_event(self):
+        self.events += 1
+        if not self.frozen and self.events >= self.warmup_events:
+            gc.collect()
+            gc.freeze()
+            self.frozen = True
+            print(f"GC frozen after {self.events} events ({gc.get_freeze_count()} objects)")
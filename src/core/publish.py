@@ -0,0 +1,184 @@
+import asyncio
+import collections
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from src.core.codec import dumps
+
+
+class DropOldest:
+    """Bounded FIFO: when full, a push evicts the oldest item and counts it as dropped."""
+    def __init__(self, maxlen: int = 10_000):
+        self.items = collections.deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def push(self, item):
+        if len(self.items) == self.items.maxlen:
+            self.dropped += 1
+        self.items.append(item)
+
+    def drain(self) -> list:
+        out = list(self.items)
+        self.items.clear()
+        return out
+
+
+class Sink:
+    """
+    Destination for published quotes. publish() runs on the quote path and
+    must never block: sinks that do I/O only enqueue there and write from
+    their run() task. Sinks with wants_bytes=False receive line=None.
+    """
+    wants_bytes = True
+
+    def publish(self, quote: dict, line: bytes | None):
+        """Called once per quote; the base sink discards it."""
+
+    async def run(self):
+        """Background I/O task, started by Publisher.run()."""
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class NullSink(Sink):
+    wants_bytes = False
+
+    def publish(self, quote, line):
+        pass
+
+
+class CallbackSink(Sink):
+    """Calls fn(quote) in-process, synchronously; fn must be cheap."""
+    wants_bytes = False
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def publish(self, quote, line):
+        self.fn(quote)
+
+
+class FileSink(Sink):
+    """
+    Appends encoded quotes to a file ("-" for stdout) in batches, every
+    flush_interval_s. The write itself runs on a one-thread executor so a
+    slow disk or a stalled stdout pipe never blocks the event loop; the
+    single thread also keeps batches in order.
+    """
+    def __init__(self, path: str, maxlen: int = 10_000, flush_interval_s: float = 0.05):
+        self.path = path
+        self.fh = sys.stdout.buffer if path == "-" else open(path, "ab")
+        self.buf = DropOldest(maxlen)
+        self.flush_interval_s = flush_interval_s
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="filesink")
+
+    def publish(self, quote, line):
+        self.buf.push(line)
+
+    def _write(self, batch: list[bytes]):
+        if batch:
+            self.fh.write(b"".join(batch))
+            self.fh.flush()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            batch = self.buf.drain()
+            if batch:
+                await loop.run_in_executor(self.writer, self._write, batch)
+
+    def close(self):
+        """Writes what is still buffered after any in-flight batch, then closes the file."""
+        self.writer.submit(self._write, self.buf.drain())
+        self.writer.shutdown(wait=True)
+        if self.fh is not sys.stdout.buffer:
+            self.fh.close()
+
+    def stats(self):
+        return {"sink": f"file:{self.path}", "dropped": self.buf.dropped}
+
+
+class UnixSocketSink(Sink):
+    """
+    Serves newline-delimited quotes on a local Unix socket. Every client has
+    its own drop-oldest buffer, so a slow reader loses its oldest quotes
+    instead of stalling the collector or the other clients.
+    """
+    def __init__(self, path: str, maxlen: int = 10_000):
+        self.path = path
+        self.maxlen = maxlen
+        self.clients: dict[asyncio.StreamWriter, tuple[DropOldest, asyncio.Event]] = {}
+        self.dropped = 0
+
+    def publish(self, quote, line):
+        for buf, wake in self.clients.values():
+            buf.push(line)
+            wake.set()
+
+    async def _serve_client(self, reader, writer):
+        buf, wake = DropOldest(self.maxlen), asyncio.Event()
+        self.clients[writer] = (buf, wake)
+        try:
+            while True:
+                await wake.wait()
+                wake.clear()
+                writer.write(b"".join(buf.drain()))
+                await writer.drain()
+        except (ConnectionError, BrokenPipeError):
+            pass
+        finally:
+            self.dropped += buf.dropped
+            del self.clients[writer]
+            writer.close()
+
+    async def run(self):
+        server = await asyncio.start_unix_server(self._serve_client, path=self.path)
+        print(f"Publishing quotes on unix socket {self.path}")
+        async with server:
+            await server.serve_forever()
+
+    def stats(self):
+        return {"sink": f"unix:{self.path}", "clients": len(self.clients),
+                "dropped": self.dropped + sum(b.dropped for b, _ in self.clients.values())}
+
+
+def make_sink(spec: str) -> Sink:
+    """Sink from a CLI spec: null | stdout | file:PATH | unix:PATH."""
+    kind, _, arg = spec.partition(":")
+    if kind == "null":
+        return NullSink()
+    if kind == "stdout":
+        return FileSink("-")
+    if kind == "file" and arg:
+        return FileSink(arg)
+    if kind == "unix" and arg:
+        return UnixSocketSink(arg)
+    raise ValueError(f"unknown sink {spec!r}; expected null, stdout, file:PATH or unix:PATH")
+
+
+class Publisher:
+    """Fans each quote out to every sink, encoding it at most once."""
+    def __init__(self, sinks: list[Sink] | None = None):
+        self.sinks = sinks or [NullSink()]
+        self.wants_bytes = any(s.wants_bytes for s in self.sinks)
+
+    def publish(self, quote: dict, line: bytes | None = None):
+        """`line` is the already encoded quote (e.g. from Recorder.log), if any."""
+        if line is None and self.wants_bytes:
+            line = dumps(quote) + b"\n"
+        for sink in self.sinks:
+            sink.publish(quote, line)
+
+    async def run(self):
+        await asyncio.gather(*(s.run() for s in self.sinks))
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def stats(self) -> list[dict]:
+        return [st for s in self.sinks if (st := s.stats())]
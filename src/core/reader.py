@@ -1,4 +1,26 @@
-import pandas as pd, json, pathlib
+import pandas as pd, json, pathlib, bisect
+from src.core.codec import loads
+from src.core.recorder import INDEX_EVERY_NS, index_path
+
+COLUMNS = ["t_arrive_ns", "mid", "bid", "ask", "symbol", "venue"]
+QUOTE_COLUMNS = ["t_ns", "mid", "bid", "ask", "symbol", "inv", "xskew", "imbalance", "sigma"]
+SLACK_NS = 1_000_000_000  # max lag between a row's own timestamp and its t_log_ns
+
+def tape_columns(row: dict | None) -> list[str]:
+    """Market rows carry t_arrive_ns/venue, quote rows the engine's t_ns."""
+    return QUOTE_COLUMNS if row is not None and "t_arrive_ns" not in row else COLUMNS
+
+def tape_ts_col(row: dict | None) -> str:
+    return tape_columns(row)[0]
+
+def _to_frame(rows: list[dict]) -> pd.DataFrame:
+    cols = tape_columns(rows[0] if rows else None)
+    # reindex: quotes logged before a field existed (e.g. xskew) get NaN
+    df = pd.DataFrame(rows, columns=None if rows else cols).reindex(columns=cols)
+    df["mid"]  = df["mid"].astype(float)
+    df["bid"]  = df["bid"].astype(float)
+    df["ask"]  = df["ask"].astype(float)
+    return df
 
 def load_jsonl(path: str) -> pd.DataFrame:
     """Return DataFrame with numeric mid/bid/ask and ns timestamps."""
@@ -6,9 +28,88 @@ def load_jsonl(path: str) -> pd.DataFrame:
     with pathlib.Path(path).open() as fh:
         for line in fh:
             rows.append(json.loads(line))
-    df = pd.DataFrame(rows)
-    df = df[["t_arrive_ns", "mid", "bid", "ask", "symbol", "venue"]]
-    df["mid"]  = df["mid"].astype(float)
-    df["bid"]  = df["bid"].astype(float)
-    df["ask"]  = df["ask"].astype(float)
-    return df
\ No newline at end of file
+    return _to_frame(rows)
+
+def read_index(path: str) -> list[tuple[int, int]]:
+    """(t_log_ns, byte offset) entries of a tape's sidecar index, [] if it has none."""
+    idx = index_path(path)
+    if not idx.exists():
+        return []
+    entries = []
+    with idx.open() as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 2:          # skip a half-written last line
+                entries.append((int(parts[0]), int(parts[1])))
+    return entries
+
+def build_index(path: str, every_ns: int = INDEX_EVERY_NS):
+    """Writes the sidecar index for a tape recorded before the Recorder kept one."""
+    last, offset = None, 0
+    with pathlib.Path(path).open("rb") as fh, index_path(path).open("w") as out:
+        for line in fh:
+            t = loads(line)["t_log_ns"]
+            if last is None or t - last >= every_ns:
+                out.write(f"{t} {offset}\n")
+                last = t
+            offset += len(line)
+
+def iter_range(path: str, t0: int, t1: int, symbol: str | None = None, venue: str | None = None,
+               ts_col: str = "t_log_ns", slack_ns: int = SLACK_NS):
+    """
+    Yields the rows of a tape with t0 <= row[ts_col] < t1, optionally for one
+    symbol/venue, reading only the bytes around that window. Seeks via the .idx
+    sidecar (falls back to a scan from the start without one) and stops once
+    t_log_ns passes t1 + slack_ns. Rows are logged after they arrive, so
+    t_arrive_ns <= t_log_ns and seeking on t_log_ns never skips a match.
+    ts_col=None uses the tape's own timestamp (t_arrive_ns or a quote's t_ns).
+    """
+    idx = read_index(path)
+    # last entry strictly before t0: with a coarse clock, rows logged at t0
+    # can precede an entry that also carries t0
+    i = bisect.bisect_left(idx, (t0, -1)) - 1
+    start = idx[i][1] if i >= 0 else 0
+    with pathlib.Path(path).open("rb") as fh:
+        fh.seek(start)
+        for line in fh:
+            if not line.endswith(b"\n"):   # row still being written
+                break
+            row = loads(line)
+            if ts_col is None:
+                ts_col = tape_ts_col(row)
+            t_log = row["t_log_ns"] if "t_log_ns" in row else row[ts_col]
+            if t_log >= t1 + slack_ns:
+                break
+            t = row[ts_col]
+            if t0 <= t < t1 and (symbol is None or row.get("symbol") == symbol) \
+                    and (venue is None or row.get("venue") == venue):
+                yield row
+
+def load_range(path: str, t0: int, t1: int, symbol: str | None = None, venue: str | None = None,
+               ts_col: str | None = None) -> pd.DataFrame:
+    """
+    load_jsonl restricted to t0 <= ts_col < t1 (and symbol/venue) without
+    parsing the whole day. ts_col defaults to the tape's own timestamp.
+    """
+    return _to_frame(list(iter_range(path, t0, t1, symbol, venue, ts_col)))
+
+def read_from(path: str, offset: int) -> tuple[list[dict], int]:
+    """
+    Rows appended to a tape since byte `offset`, and the offset to resume from.
+    A trailing line the recorder is still writing is left for the next call.
+    Raises FileNotFoundError for a missing tape and ValueError if it is now
+    shorter than `offset` (truncated or replaced since the last read).
+    """
+    rows = []
+    with pathlib.Path(path).open("rb") as fh:
+        size = fh.seek(0, 2)
+        if size < offset:
+            raise ValueError(f"{path} has {size} bytes, fewer than the {offset} already replayed; "
+                             "was it truncated or replaced?")
+        fh.seek(offset)
+        for line in fh:
+            if not line.endswith(b"\n"):
+                break
+            rows.append(loads(line))
+            offset += len(line)
+    return rows, offset
@@ -1,21 +1,37 @@
-import json
 import time
 import pathlib
+from src.core.codec import dumps
+
+INDEX_EVERY_NS = 1_000_000_000  # one sidecar index entry per second of tape
+
+def index_path(path) -> pathlib.Path:
+    """Sidecar seek index of a tape: market_data_20250729.jsonl -> market_data_20250729.idx"""
+    return pathlib.Path(path).with_suffix(".idx")
 
 class Recorder:
-    def __init__(self, log_directory: str = "logs"):
+    def __init__(self, log_directory: str = "logs", index_every_ns: int = INDEX_EVERY_NS):
         self.logdir = pathlib.Path(log_directory)
         self.logdir.mkdir(exist_ok=True)
         self.file_handles = {}
+        # per tape: sidecar index handle, current byte size, t_log_ns of last index entry
+        self.index_every_ns = index_every_ns
+        self.index_handles = {}
+        self.offsets = {}
+        self.last_indexed_ns = {}
         print(f"Recorder initialized. Logging to directory: {self.logdir.resolve()}")
 
-    def log(self, event_name: str, data: dict):
+    def log(self, event_name: str, data: dict) -> bytes:
         """
         Appends a dictionary to a daily .jsonl file for a given event type.
-        
+        At most every `index_every_ns` it also appends "<t_log_ns> <byte offset>"
+        to the tape's .idx sidecar, so readers can seek to a time range.
+
         Args:
             event_name (str): The name of the event (e.g., 'market_data', 'quotes').
             data (dict): The data dictionary to log.
+
+        Returns:
+            The encoded line, so publishers can reuse it instead of re-encoding.
         """
         # Get the current date for the filename, e.g., 20250729
         today = time.strftime('%Y%m%d')
@@ -23,15 +39,27 @@ class Recorder:
 
         if file_key not in self.file_handles:
             filepath = self.logdir / f"{file_key}.jsonl"
-            self.file_handles[file_key] = filepath.open("a", buffering=1)
+            # unbuffered: one write() per line, as line buffering did for text mode
+            self.file_handles[file_key] = filepath.open("ab", buffering=0)
+            self.index_handles[file_key] = index_path(filepath).open("a", buffering=1)
+            self.offsets[file_key] = filepath.stat().st_size
+            self.last_indexed_ns[file_key] = 0
 
         # Write the data as a single, compressed JSON line
         # The 't_log_ns' is added to have a consistent timestamp of when the event was recorded
-        log_entry = {"t_log_ns": time.time_ns(), **data}
-        self.file_handles[file_key].write(json.dumps(log_entry, separators=(",",":")) + "\n")
+        t_log_ns = time.time_ns()
+        log_entry = {"t_log_ns": t_log_ns, **data}
+        line = dumps(log_entry) + b"\n"
+        if t_log_ns - self.last_indexed_ns[file_key] >= self.index_every_ns:
+            self.index_handles[file_key].write(f"{t_log_ns} {self.offsets[file_key]}\n")
+            self.last_indexed_ns[file_key] = t_log_ns
+        self.file_handles[file_key].write(line)
+        self.offsets[file_key] += len(line)
+        return line
 
     def close(self):
         """Closes all open file handles."""
-        for handle in self.file_handles.values():
+        for handle in (*self.file_handles.values(), *self.index_handles.values()):
             handle.close()
-        self.file_handles = {}
\ No newline at end of file
+        self.file_handles = {}
+        self.index_handles = {}
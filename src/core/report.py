@@ -0,0 +1,48 @@
+import json
+import pathlib
+
+_out_dir: pathlib.Path | None = None
+
+
+def set_headless(out_dir: str):
+    """
+    Switch matplotlib to the non-interactive Agg backend and send every figure
+    and metrics table to out_dir instead of opening windows.
+    Must be called before pyplot is imported anywhere.
+    """
+    global _out_dir
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+    except ImportError:
+        pass  # metrics-only jobs (stats, backtest) don't need matplotlib
+    _out_dir = pathlib.Path(out_dir)
+    _out_dir.mkdir(parents=True, exist_ok=True)
+
+
+def finish_figure(name: str):
+    """Saves the current figure as <out_dir>/<name>.png in headless mode, otherwise shows it."""
+    import matplotlib.pyplot as plt
+    if _out_dir is None:
+        plt.show()
+        return
+    path = _out_dir / f"{name}.png"
+    plt.savefig(path, dpi=120)
+    plt.close()
+    print(f"Saved figure: {path}")
+
+
+def write_metrics(name: str, data):
+    """
+    Writes a metrics dict (as JSON) or DataFrame (as CSV) to out_dir in headless mode.
+    Does nothing in interactive mode, where callers already print their results.
+    """
+    if _out_dir is None:
+        return
+    if hasattr(data, "to_csv"):
+        path = _out_dir / f"{name}.csv"
+        data.to_csv(path, index=False)
+    else:
+        path = _out_dir / f"{name}.json"
+        path.write_text(json.dumps(data, indent=2, default=str))
+    print(f"Saved metrics: {path}")
@@ -1,7 +1,11 @@
+import pandas as pd
 from src.core.reader import load_jsonl
 
 def calc_day_stats(path: str, symbol: str):
-    df = load_jsonl(path)
+    return day_stats(load_jsonl(path), symbol)
+
+def day_stats(df: pd.DataFrame, symbol: str):
+    """calc_day_stats on an already loaded tape."""
     df = df[df.symbol == symbol].sort_values("t_arrive_ns")
 
     df["spread"] = df["ask"] - df["bid"]
@@ -1,17 +1,26 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, r2_score
-import matplotlib.pyplot as plt
-import lightgbm as lgb
-def load_and_merge_data(market_path: str, quotes_path: str) -> pd.DataFrame:
+from src.core.report import finish_figure, write_metrics
+# sklearn, lightgbm and matplotlib are imported inside the functions that use
+# them so loading this module (e.g. for feature_engineering) stays cheap.
+def _read_tape(path: str, t0: int | None, t1: int | None) -> pd.DataFrame:
+    if t0 is None and t1 is None:
+        return pd.read_json(path, lines=True)
+    from src.core.reader import iter_range
+    t0 = 0 if t0 is None else t0
+    t1 = 2**63 - 1 if t1 is None else t1
+    return pd.DataFrame(list(iter_range(path, t0, t1)))
+
+def load_and_merge_data(market_path: str, quotes_path: str,
+                        t0: int | None = None, t1: int | None = None) -> pd.DataFrame:
     """
-    Loads and merges market (target) and quote (feature) data.
+    Loads and merges market (target) and quote (feature) data. With t0/t1
+    (t_log_ns bounds) only that window of each tape is read, via its index.
     """
-    market = pd.read_json(market_path, lines=True)
+    market = _read_tape(market_path, t0, t1)
     market['ts'] = pd.to_datetime(market['t_log_ns'], unit='ns')
     
-    quotes = pd.read_json(quotes_path, lines=True)
+    quotes = _read_tape(quotes_path, t0, t1)
     quotes['ts'] = pd.to_datetime(quotes['t_log_ns'], unit='ns')
 
     df = pd.merge_asof(
@@ -47,6 +56,9 @@ def train_augmented_model(train_df: pd.DataFrame, test_df: pd.DataFrame, feature
     """
     Trains the two-stage augmented model using LightGBM and returns predictions.
     """
+    import lightgbm as lgb
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, r2_score
     print("\n--- Training with LightGBM ---")
     X_train = train_df[features].values
     y_train = train_df['y_target'].values
@@ -112,6 +124,7 @@ def train_augmented_model(train_df: pd.DataFrame, test_df: pd.DataFrame, feature
 
 def plot_pnl_backtest(test_df: pd.DataFrame, predictions: np.ndarray):
     """Simple sign-based PnL backtest visualization."""
+    import matplotlib.pyplot as plt
     pnl_df = test_df.copy()
     pnl_df['signal'] = np.sign(predictions)
     pnl_df['pnl'] = pnl_df['signal'] * pnl_df['y_target']
@@ -123,10 +136,11 @@ def plot_pnl_backtest(test_df: pd.DataFrame, predictions: np.ndarray):
     plt.xlabel('Time')
     plt.ylabel('Cumulative PnL')
     plt.grid(True)
-    plt.show()
+    finish_figure("strategy_pnl")
 
 def plot_sensor_calibration(sensor_values: np.ndarray, realized_returns: np.ndarray, n_bins: int = 20):
     """Bins sensor values and plots average realized return per bin to check calibration."""
+    import matplotlib.pyplot as plt
     calib_df = pd.DataFrame({'sensor': sensor_values, 'realized': realized_returns})
     calib_df['bin'] = pd.qcut(calib_df['sensor'], q=n_bins, duplicates='drop', labels=False)
     binned_data = calib_df.groupby('bin')[['sensor', 'realized']].mean()
@@ -137,22 +151,21 @@ def plot_sensor_calibration(sensor_values: np.ndarray, realized_returns: np.ndar
     plt.xlabel('Predicted Imbalance (Sensor Value)')
     plt.ylabel('Average Realized Mid-Price Return')
     plt.grid(True)
-    plt.show()
-
-def main():
-    """Main execution workflow."""
+    finish_figure("sensor_calibration")
 
+QUOTES_PATH = "logs/quotes_20250730.jsonl"
+MARKET_PATH = "logs/market_data_20250730.jsonl"
 
-    QUOTES_PATH = "logs/quotes_20250730.jsonl"
-    MARKET_PATH = "logs/market_data_20250730.jsonl"
-
+def main(market_path: str = MARKET_PATH, quotes_path: str = QUOTES_PATH,
+         t0: int | None = None, t1: int | None = None):
+    """Main execution workflow."""
 
     try:
-        df = load_and_merge_data(MARKET_PATH, QUOTES_PATH)
+        df = load_and_merge_data(market_path, quotes_path, t0, t1)
         df = feature_engineering(df)
         print(f"Loaded and processed {len(df)} aligned data points.")
     except FileNotFoundError:
-        print(f"Error: Data file not found. Please check your path: {MARKET_PATH} or {QUOTES_PATH}")
+        print(f"Error: Data file not found. Please check your path: {market_path} or {quotes_path}")
         return
     except ValueError as e:
         print(f"ValueError: Your JSON file might be empty or malformed. Error: {e}")
@@ -176,7 +189,8 @@ def main():
 
 
     features = ['spread', 'imbalance5']
-    predictions, sensor_output, _ = train_augmented_model(train_df, test_df, features)
+    predictions, sensor_output, metrics = train_augmented_model(train_df, test_df, features)
+    write_metrics("strategy_metrics", metrics)
 
     plot_sensor_calibration(sensor_output, test_df['y_target'].values)
     plot_pnl_backtest(test_df, predictions)
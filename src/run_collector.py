@@ -1,33 +1,109 @@
 import asyncio
-import json
+import time
 from src.connectors import okx, binance
+from src.connectors.supervisor import Supervisor
 from src.core.fair_price import FairPriceEngine
+from src.core.init_config import build_cfg
+from src.core.profiling import CollectorProfiler, GCPolicy
+from src.core.publish import Publisher, make_sink
 from src.core.recorder import Recorder
 
-async def consumer(q:asyncio.Queue, engine:FairPriceEngine, recorder: Recorder):
+# Used when no calibration tape is given: 1-tick median spread and unit 1s variance
+DEFAULT_STATS = {"var_1s": 1.0, "median_spread": 0.01}
+
+def handle(engine: FairPriceEngine, recorder: Recorder, publisher: Publisher,
+           venue: str, symbol: str, snap: dict):
+    """One book update: record it, refresh the fair value, record and publish the quote."""
+    recorder.log("market_data", snap)
+    engine.update(venue, symbol, snap)
+    quote = engine.quote(symbol)
+    if quote:
+        # publish the exact line written to the tape, encoded once
+        publisher.publish(quote, recorder.log("quotes", quote))
+
+async def consumer(q:asyncio.Queue, engine:FairPriceEngine, recorder: Recorder, publisher: Publisher,
+                   profiler: CollectorProfiler | None = None, gc_policy: GCPolicy | None = None):
     while True:
         venue, symbol, snap = await q.get()
-        recorder.log("market_data", snap)
-        engine.update(venue, symbol, snap)
-        quote = engine.quote(symbol)
-        if quote:
-            recorder.log("quotes", quote)
-            print(json.dumps(quote, indent=None))
-
-async def main():
-    q = asyncio.Queue()
-    recorder = Recorder()
-    eng = FairPriceEngine(a=1.0, b=0.5, kappa=1e-6)
-    tasks = [consumer(q, eng, recorder)]
+        if profiler and profiler.churn_due():
+            profiler.trace_event(handle, engine, recorder, publisher, venue, symbol, snap)
+        else:
+            t0 = time.perf_counter_ns()
+            handle(engine, recorder, publisher, venue, symbol, snap)
+            if profiler:
+                profiler.on_event(time.perf_counter_ns() - t0)
+        if gc_policy:
+            gc_policy.on_event()
+
+async def health_reporter(supervisors: list[Supervisor], publisher: Publisher,
+                          recorder: Recorder, interval_s: float):
+    """Logs reconnect/gap/staleness metrics of every feed and sink drops to health_<date>.jsonl."""
+    while True:
+        await asyncio.sleep(interval_s)
+        now = time.time_ns()
+        for sup in supervisors:
+            recorder.log("health", sup.health.snapshot(now))
+        sinks = publisher.stats()
+        if sinks:
+            recorder.log("health", {"feed": "publisher", "sinks": sinks})
 
-    binance_okx_symbol = "BTCUSDT"
+async def profile_reporter(profiler: CollectorProfiler, recorder: Recorder, interval_s: float):
+    """Logs allocation/GC/RSS/latency windows to profile_<date>.jsonl."""
+    while True:
+        await asyncio.sleep(interval_s)
+        rep = profiler.report()
+        recorder.log("profile", rep)
+        print(f"profile: {rep['window_events']} events, p99 {rep['event_p99_us']:.0f}us, "
+              f"gc p99 {rep['gc']['pause_p99_us']:.0f}us, rss {rep['rss_mb']:.1f}MB "
+              f"(+{rep['rss_growth_mb']:.1f})")
+
+async def main(symbols="BTCUSDT", log_dir: str = "logs",
+               calibrate: str | None = None, tick: float = 0.01,
+               health_interval_s: float = 5.0, sinks: list[str] | None = None,
+               profile: bool = False, profile_interval_s: float = 10.0,
+               gc_policy: GCPolicy | None = None,
+               gamma_port: float = 0.0, cov_halflife_s: float = 60.0,
+               profile_alloc: bool = False):
+    symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+    base = build_cfg(DEFAULT_STATS, tick=tick)
+    symbol_configs = {}
+    if calibrate:
+        # pandas is only needed when calibrating from a recorded tape;
+        # every symbol gets its own spread/variance calibration
+        from src.core.stats_extract import calc_day_stats
+        symbol_configs = {s: build_cfg(calc_day_stats(calibrate, s), tick=tick) for s in symbols}
+
+    q = asyncio.Queue()
+    recorder = Recorder(log_dir)
+    risk = None
+    if gamma_port:
+        # numpy is only loaded when the portfolio skew is on
+        from src.core.portfolio import PortfolioRisk
+        risk = PortfolioRisk(gamma_port, halflife_s=cov_halflife_s, symbols=symbols)
+    eng = FairPriceEngine(base, risk, symbol_configs)
+    publisher = Publisher([make_sink(s) for s in sinks or ["null"]])
+    # tracemalloc is opt-in: it slows every allocation, inflating latency and GC pauses
+    profiler = CollectorProfiler(alloc=profile_alloc) if profile else None
+    if profiler:
+        profiler.start()
+    if gc_policy:
+        gc_policy.start()
+    tasks = [consumer(q, eng, recorder, publisher, profiler, gc_policy), publisher.run()]
 
-    tasks.append(okx.stream(q, binance_okx_symbol))
-    tasks.append(binance.stream(q, binance_okx_symbol))
+    # one multiplexed socket per venue, each kept alive by its supervisor
+    sups = [Supervisor("okx"), Supervisor("binance")]
+    tasks.append(okx.stream(q, symbols, sups[0]))
+    tasks.append(binance.stream(q, symbols, sups[1]))
+    tasks.append(health_reporter(sups, publisher, recorder, health_interval_s))
+    if profiler:
+        tasks.append(profile_reporter(profiler, recorder, profile_interval_s))
     try:
         await asyncio.gather(*tasks)
     finally:
+        if profiler:
+            profiler.stop()
+        publisher.close()
         recorder.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+import json
+import math
+import pandas as pd
+from src.core.backtest import BackTester
+from src.core.init_config import build_cfg
+
+CFG = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+
+def _append(path, start, n):
+    t0 = 1_753_750_000_000_000_000
+    with open(path, "a") as fh:
+        for i in range(start, start + n):
+            mid = 100 + 0.05 * math.sin(i / 4)
+            fh.write(json.dumps({"venue": "okx" if i % 3 else "binance", "symbol": "BTCUSDT",
+                                 "t_arrive_ns": t0 + i * 40_000_000,
+                                 "mid": mid, "bid": mid - 0.01, "ask": mid + 0.01}) + "\n")
+
+def test_resumed_backtest_matches_full_replay(tmp_path):
+    tape, state = tmp_path / "market_data.jsonl", tmp_path / "state.pkl"
+    for mode in ("deterministic", "poisson"):
+        tape.unlink(missing_ok=True)
+        _append(tape, 0, 150)
+        bt = BackTester.follow(str(tape), "BTCUSDT", CFG, mode, seed=3)
+        bt.update()
+        bt.save(str(state))
+
+        _append(tape, 150, 150)
+        complete = pd.DataFrame([json.loads(l) for l in tape.read_text().splitlines()])
+        with open(tape, "a") as fh:
+            fh.write('{"venue": "okx", "symbol": "BTC')   # row still being written
+
+        resumed = BackTester.load(str(state))
+        res = resumed.update()
+        assert resumed.update() == res                    # nothing new, nothing replayed twice
+        assert res == BackTester(complete, "BTCUSDT", CFG, mode, seed=3).run()
+
+def test_fill_in_one_symbol_moves_the_other_quote():
+    from src.core.portfolio import PortfolioRisk
+    risk = PortfolioRisk(gamma=1e3, sample_s=60.0, symbols=["BTCUSDT", "ETHUSDT"])
+    risk.cov[:] = [[1e-6, 1e-6], [1e-6, 1e-6]]
+    btc = BackTester.follow("unused", "BTCUSDT", CFG, seed=0, risk=risk)
+    eth = BackTester.follow("unused", "ETHUSDT", CFG, seed=0, risk=risk)
+    eth.step(0, "okx", 10.0, 9.99, 10.01)
+    assert eth.last_q["xskew"] == 0.0
+    btc.step(1_000_000, "okx", 100.0, 99.99, 100.01)
+    btc.step(2_000_000, "okx", 101.0, 100.99, 101.01)    # through our ask: we sell 1
+    assert btc.result()["inv"] == -1 and risk.get("BTCUSDT") == -1
+    eth.step(200_000_000, "okx", 10.0, 9.99, 10.01)
+    assert eth.last_q["xskew"] < 0 and eth.last_q["inv"] == 0
+
+def test_run_portfolio_replays_symbols_in_time_order():
+    from src.core.backtest import run_portfolio
+    from src.core.portfolio import PortfolioRisk
+    t0 = 1_753_750_000_000_000_000
+    rows = []
+    for i in range(400):
+        for sym, px in (("BTCUSDT", 100.0), ("ETHUSDT", 10.0)):
+            mid = px * (1 + 0.001 * math.sin(i / 6 + (sym == "ETHUSDT")))
+            rows.append({"venue": "okx", "symbol": sym, "t_arrive_ns": t0 + i * 40_000_000,
+                         "mid": mid, "bid": mid - 0.01, "ask": mid + 0.01})
+    df = pd.DataFrame(rows)
+
+    def make():
+        risk = PortfolioRisk(gamma=1e3, symbols=["BTCUSDT", "ETHUSDT"])
+        return risk, [BackTester(df, s, CFG, risk=risk) for s in ("BTCUSDT", "ETHUSDT")]
+
+    risk, testers = make()
+    res = run_portfolio(testers)
+    assert risk.n_samples > 10 and risk.cov[1, 1] > 0
+
+    risk2, (btc, eth) = make()
+    by_sym = {"BTCUSDT": btc, "ETHUSDT": eth}
+    for r in sorted(rows, key=lambda r: r["t_arrive_ns"]):
+        by_sym[r["symbol"]].step(r["t_arrive_ns"], r["venue"], r["mid"], r["bid"], r["ask"])
+    assert res == {"BTCUSDT": btc.result(), "ETHUSDT": eth.result()}
+
+def test_interrupted_save_keeps_the_previous_state(tmp_path, monkeypatch):
+    import os, pytest
+    tape, state = tmp_path / "market_data.jsonl", tmp_path / "state.pkl"
+    _append(tape, 0, 50)
+    bt = BackTester.follow(str(tape), "BTCUSDT", CFG)
+    res = bt.update()
+    bt.save(str(state))
+    _append(tape, 50, 50)
+    bt.update()
+
+    def killed(src, dst):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(os, "replace", killed)
+    with pytest.raises(KeyboardInterrupt):
+        bt.save(str(state))
+    monkeypatch.undo()
+    assert BackTester.load(str(state)).result() == res
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
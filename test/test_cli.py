@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from src.cli import main
+
+HEAVY = ("pandas", "matplotlib", "sklearn", "lightgbm")
+
+def test_collector_import_is_light():
+    code = (
+        "import sys, src.cli, src.run_collector;"
+        f"print([m for m in {HEAVY!r} if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+def test_headless_backtest_writes_metrics(tmp_path):
+    tape = tmp_path / "market_data.jsonl"
+    t0 = 1_753_750_000_000_000_000
+    with tape.open("w") as fh:
+        for i in range(50):
+            mid = 100.0 + 0.01 * (i % 7)
+            fh.write(json.dumps({"venue": "okx", "symbol": "BTCUSDT", "t_arrive_ns": t0 + i * 200_000_000,
+                                 "mid": mid, "bid": mid - 0.01, "ask": mid + 0.01}) + "\n")
+    out_dir = tmp_path / "reports"
+    main(["--headless", "--out-dir", str(out_dir), "backtest", "--data", str(tape)])
+    res = json.loads((out_dir / "backtest.json").read_text())
+    assert set(res) == {"pnl", "cash", "inv", "trades"}
+
+def test_follow_resume_rejects_conflicting_options(tmp_path):
+    import pytest
+    tape, state = tmp_path / "market_data.jsonl", tmp_path / "state.pkl"
+    t0 = 1_753_750_000_000_000_000
+    tape.write_text("".join(json.dumps({"venue": "okx", "symbol": "BTCUSDT", "t_arrive_ns": t0 + i,
+                                        "mid": 100.0, "bid": 99.99, "ask": 100.01}) + "\n"
+                            for i in range(20)))
+    main(["backtest", "--data", str(tape), "--follow", str(state), "--seed", "1"])
+    main(["backtest", "--data", str(tape), "--follow", str(state), "--seed", "1"])
+    other = tmp_path / "other.jsonl"
+    other.write_text(tape.read_text())
+    for extra in (["--data", str(other)], ["--data", str(tape), "--symbol", "ETHUSDT"],
+                  ["--data", str(tape), "--seed", "2"], ["--data", str(tape), "--fill-mode", "poisson"],
+                  ["--data", str(tape), "--end", str(t0)]):
+        with pytest.raises(SystemExit, match="backtest"):
+            main(["backtest", "--follow", str(state), *extra])
+
+def test_batch_flags_parse_on_either_side_of_the_subcommand():
+    from src.cli import build_parser
+    p = build_parser()
+    after = p.parse_args(["sweep", "--train", "x", "--test", "y", "--headless", "--out-dir", "out"])
+    before = p.parse_args(["--headless", "--out-dir", "out", "sweep", "--train", "x", "--test", "y"])
+    assert (after.headless, after.out_dir) == (before.headless, before.out_dir) == (True, "out")
+    assert p.parse_args(["tune"]).headless is False
@@ -28,3 +28,19 @@ def test_basic_quote():
 
     # venues order or set
     assert set(q["venues_used"]) == {"okx", "binance"}
+
+def test_books_are_kept_per_symbol_and_venue():
+    from src.core.init_config import build_cfg
+    cfg = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+    eth = build_cfg({"var_1s": 1e-6, "median_spread": 0.5}, tick=0.01)
+    fp = FairPriceEngine(cfg, symbol_configs={"ETHUSDT": eth})
+    now = time.time_ns()
+    for i, (venue, symbol, mid) in enumerate([("okx", "BTCUSDT", 50010.0), ("binance", "BTCUSDT", 50000.0),
+                                              ("okx", "ETHUSDT", 3001.0), ("binance", "ETHUSDT", 3000.0)]):
+        fp.update(venue, symbol, {"symbol": symbol, "mid": mid, "bid": mid - 0.01, "ask": mid + 0.01,
+                                  "t_arrive_ns": now + i})
+    btc, eth_q = fp.quote("BTCUSDT"), fp.quote("ETHUSDT")
+    assert sorted(btc["venues_used"]) == ["binance", "okx"]
+    assert sorted(eth_q["venues_used"]) == ["binance", "okx"]
+    assert 50000.0 <= btc["mid"] <= 50010.0 and 3000.0 <= eth_q["mid"] <= 3001.0
+    assert fp.cfg("ETHUSDT") is eth and fp.cfg("BTCUSDT") is cfg
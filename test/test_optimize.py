@@ -0,0 +1,56 @@
+import math
+import pandas as pd
+from src.core.init_config import build_cfg
+from src.core.optimize import Tuner, successive_halving
+
+def test_successive_halving_promotes_best_to_full_tape():
+    cands = [{"x": float(i)} for i in range(27)]
+    calls = []
+
+    def evaluate(p, frac):
+        calls.append(frac)
+        return -abs(p["x"] - 20) * frac
+
+    hist = successive_halving(cands, evaluate, min_frac=1 / 9, eta=3)
+    assert [calls.count(f) for f in sorted(set(calls))] == [27, 9, 3]
+    full = [h for h in hist if h["frac"] == 1.0]
+    assert max(full, key=lambda h: h["score"])["params"] == {"x": 20.0}
+
+def test_tuner_runs_surrogate_rounds():
+    t0 = 1_753_750_000_000_000_000
+    rows = [{"t_arrive_ns": t0 + i * 50_000_000, "symbol": "BTCUSDT", "venue": "okx",
+             "mid": 100 + 0.05 * math.sin(i / 5), "bid": 100 + 0.05 * math.sin(i / 5) - 0.01,
+             "ask": 100 + 0.05 * math.sin(i / 5) + 0.01} for i in range(270)]
+    base = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+    tuner = Tuner(pd.DataFrame(rows), "BTCUSDT", base, min_frac=1 / 9, surrogate=True, seed=1)
+    best, history = tuner.run(n_candidates=27, rounds=2)
+    assert set(history["round"]) == {0, 1}
+    assert (history["frac"] == 1.0).sum() == 6
+    assert best.max_half >= best.min_half
+
+def test_kappa_changes_the_replay():
+    import dataclasses
+    from src.core.backtest import BackTester
+    t0 = 1_753_750_000_000_000_000
+    rows = [{"t_arrive_ns": t0 + i * 50_000_000, "symbol": "BTCUSDT", "venue": "okx",
+             "mid": 100 + 0.05 * math.sin(i / 5), "bid": 100 + 0.05 * math.sin(i / 5) - 0.01,
+             "ask": 100 + 0.05 * math.sin(i / 5) + 0.01} for i in range(270)]
+    base = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+    df = pd.DataFrame(rows)
+    flat = BackTester(df, "BTCUSDT", dataclasses.replace(base, kappa=0.0)).run()
+    leaned = BackTester(df, "BTCUSDT", dataclasses.replace(base, kappa=0.05)).run()
+    assert flat != leaned
+
+def test_poisson_tuning_is_reproducible():
+    t0 = 1_753_750_000_000_000_000
+    rows = [{"t_arrive_ns": t0 + i * 50_000_000, "symbol": "BTCUSDT", "venue": "okx",
+             "mid": 100 + 0.05 * math.sin(i / 5), "bid": 100 + 0.05 * math.sin(i / 5) - 0.01,
+             "ask": 100 + 0.05 * math.sin(i / 5) + 0.01} for i in range(270)]
+    base = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+    runs = [Tuner(pd.DataFrame(rows), "BTCUSDT", base, fill_mode="poisson", min_frac=1 / 3, seed=5)
+            for _ in range(3)]
+    p = runs[2]._random()
+    assert runs[2].evaluate(p, 1.0) == runs[2].evaluate(p, 1.0)
+    runs = runs[:2]
+    (best_a, hist_a), (best_b, hist_b) = (t.run(n_candidates=9) for t in runs)
+    assert best_a == best_b and hist_a.equals(hist_b)
@@ -0,0 +1,44 @@
+import math
+import numpy as np
+from src.core.fair_price import FairPriceEngine
+from src.core.init_config import build_cfg
+from src.core.portfolio import PortfolioRisk
+
+def test_rank1_updates_match_batch_ewma():
+    rng = np.random.default_rng(0)
+    risk = PortfolioRisk(gamma=1.0, halflife_s=10.0, sample_s=1.0, symbols=["A", "B", "C"])
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, size=(50, 3)), axis=0))
+    for k, row in enumerate(prices):
+        for s, p in zip("ABC", row):
+            risk.on_fair(s, p, k * 1_000_000_000)
+    # the sample at step k sees prices up to k-1, so the last return is still pending
+    r = np.diff(np.log(prices), axis=0)[:-1]
+    a = 1 - math.exp(math.log(0.5) / 10.0)
+    want = np.zeros((3, 3))
+    for x in r:
+        want = (1 - a) * want + a * np.outer(x, x)
+    assert risk.n_samples == 48
+    assert np.allclose(risk.cov, want)
+
+def test_cross_skew_leans_against_correlated_positions():
+    risk = PortfolioRisk(gamma=2.0, symbols=["A", "B"])
+    risk.price[:] = [100.0, 50.0]
+    risk.cov[:] = [[4e-6, 3e-6], [3e-6, 9e-6]]
+    risk.update("A", 1.0, -1)          # bought 1 A
+    assert risk.get("A") == 1.0
+    assert risk.skew("A") == 0.0       # own inventory is left to kappa
+    assert math.isclose(risk.skew("B"), 2.0 * 50.0 * 3e-6 * 100.0)
+    assert math.isclose(risk.skew("A", cross_only=False), 2.0 * 100.0 * 4e-6 * 100.0)
+
+def test_engine_applies_cross_skew():
+    cfg = build_cfg({"var_1s": 1e-4, "median_spread": 0.02}, tick=0.01)
+    risk = PortfolioRisk(gamma=1e3, symbols=["BTCUSDT", "ETHUSDT"])
+    eng = FairPriceEngine(cfg, risk)
+    risk.cov[:] = [[1e-6, 1e-6], [1e-6, 1e-6]]
+    eng.inv.update("BTCUSDT", 1.0, -1)
+    eng.update("okx", "BTCUSDT", {"symbol": "BTCUSDT", "mid": 100.0, "bid": 99.99, "ask": 100.01, "t_arrive_ns": 1})
+    eng.quote("BTCUSDT")
+    eng.update("binance", "ETHUSDT", {"symbol": "ETHUSDT", "mid": 10.0, "bid": 9.99, "ask": 10.01, "t_arrive_ns": 2})
+    q = eng.quote("ETHUSDT")
+    assert q["xskew"] > 0
+    assert math.isclose((q["bid"] + q["ask"]) / 2, q["mid"] - q["xskew"])
@@ -0,0 +1,93 @@
+import gc
+from src.core.profiling import CollectorProfiler, GCMonitor, GCPolicy
+
+def test_gc_monitor_times_collections():
+    mon = GCMonitor()
+    mon.start()
+    try:
+        gc.collect()
+    finally:
+        mon.stop()
+    snap = mon.snapshot()
+    assert snap["gen"][2]["count"] >= 1 and snap["gen"][2]["total_ms"] > 0
+
+def test_profiler_attributes_allocations_per_event():
+    kept = []
+    prof = CollectorProfiler(alloc=True)
+    prof.start()
+    try:
+        for _ in range(100):
+            kept.append({"bids5": [(1.0, 2.0)] * 5})   # retained: shows up per event
+            prof.on_event(1_000)
+        rep = prof.report()
+    finally:
+        prof.stop()
+    assert rep["window_events"] == 100 and rep["rss_mb"] > 0
+    top = [s for s in rep["alloc_sites"] if "test_profiling.py" in s["site"]]
+    assert top and top[0]["blocks_per_event"] >= 1
+
+def test_gc_policy_freezes_after_warmup():
+    old = gc.get_threshold()
+    policy = GCPolicy((10_000, 20, 30), warmup_events=3)
+    try:
+        policy.start()
+        assert gc.get_threshold() == (10_000, 20, 30)
+        for _ in range(3):
+            policy.on_event()
+        assert policy.frozen and gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+        gc.set_threshold(*old)
+
+def test_profiler_counts_churn_that_is_not_retained():
+    def build():
+        return [b"x" * (64 + i) for i in range(50)]
+
+    def event():
+        levels = build()                 # freed when event() returns
+        return len(levels)
+
+    prof = CollectorProfiler(alloc=True, churn_every=1)
+    prof.start()
+    try:
+        for _ in range(5):
+            assert prof.churn_due()
+            assert prof.trace_event(event) == 50
+        rep = prof.report()
+    finally:
+        prof.stop()
+    assert rep["churn_events"] == 5
+    sites = [s for s in rep["alloc_churn"] if "test_profiling.py" in s["site"]]
+    assert sites and max(s["blocks_per_event"] for s in sites) >= 50
+    assert not any("test_profiling.py" in s["site"] for s in rep.get("alloc_sites", []))
+
+def test_traced_event_cost_does_not_grow_with_the_heap():
+    import time
+    def event():
+        return sum(len(str(i)) for i in range(20))
+
+    prof = CollectorProfiler(alloc=True, churn_every=1)
+    prof.start()
+    try:
+        warm = [{"i": i, "bids5": [(1.0, 2.0)]} for i in range(20_000)]   # live, traced
+        t0 = time.perf_counter()
+        prof.trace_event(event)
+        elapsed = time.perf_counter() - t0
+        rep = prof.report()
+    finally:
+        prof.stop()
+    assert len(warm) == 20_000 and elapsed < 1.0
+    sites = [s["site"] for s in rep["alloc_churn"]]
+    assert sites and all("test_profiling.py" in s for s in sites)   # no profiler/re/fnmatch sites
+
+def test_profiler_without_alloc_leaves_tracemalloc_off():
+    import tracemalloc
+    prof = CollectorProfiler(alloc=False, churn_every=1)
+    prof.start()
+    try:
+        assert not tracemalloc.is_tracing() and not prof.churn_due()
+        prof.on_event(1_000)
+        rep = prof.report()
+    finally:
+        prof.stop()
+    assert rep["window_events"] == 1 and "alloc_sites" not in rep
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import pytest
+from src.core.publish import CallbackSink, DropOldest, FileSink, Publisher, UnixSocketSink, make_sink
+from src.core.recorder import Recorder
+
+QUOTE = {"t_ns": 1, "symbol": "BTCUSDT", "mid": 100.0, "bid": 99.9, "ask": 100.1}
+
+def test_drop_oldest_keeps_newest():
+    buf = DropOldest(3)
+    for i in range(5):
+        buf.push(i)
+    assert buf.drain() == [2, 3, 4] and buf.dropped == 2
+
+def test_publisher_reuses_recorder_line(tmp_path):
+    seen = []
+    out = tmp_path / "quotes.out"
+    fsink = FileSink(str(out))
+    pub = Publisher([CallbackSink(seen.append), fsink])
+    line = Recorder(str(tmp_path)).log("quotes", QUOTE)
+    pub.publish(QUOTE, line)
+    pub.close()
+    assert seen == [QUOTE]
+    assert out.read_bytes() == line
+    assert json.loads(line)["mid"] == 100.0
+
+def test_unix_socket_sink_streams_lines(tmp_path):
+    path = str(tmp_path / "q.sock")
+
+    async def go():
+        sink = UnixSocketSink(path)
+        server = asyncio.create_task(sink.run())
+        while not (tmp_path / "q.sock").exists():
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+        while not sink.clients:
+            await asyncio.sleep(0.01)
+        pub = Publisher([sink])
+        for i in range(3):
+            pub.publish({**QUOTE, "t_ns": i})
+        lines = [json.loads(await reader.readline()) for _ in range(3)]
+        writer.close()
+        server.cancel()
+        return lines
+
+    assert [q["t_ns"] for q in asyncio.run(go())] == [0, 1, 2]
+
+def test_make_sink_rejects_unknown_spec():
+    with pytest.raises(ValueError):
+        make_sink("kafka:topic")
+
+def test_file_sink_writes_off_the_event_loop(tmp_path):
+    import threading
+    out = tmp_path / "quotes.out"
+    sink = FileSink(str(out), flush_interval_s=0.001)
+    writers = []
+    write = sink._write
+    sink._write = lambda batch: (writers.append(threading.current_thread()), write(batch))
+
+    async def go():
+        task = asyncio.create_task(sink.run())
+        sink.publish(QUOTE, b"a\n")
+        while not writers:
+            await asyncio.sleep(0.001)
+        sink.publish(QUOTE, b"b\n")
+        task.cancel()
+
+    asyncio.run(go())
+    sink.close()
+    assert threading.main_thread() not in writers
+    assert out.read_bytes() == b"a\nb\n"
@@ -0,0 +1,82 @@
+import json
+import time
+from src.core.reader import build_index, iter_range, load_jsonl, load_range, read_index
+from src.core.recorder import Recorder, index_path
+
+def _record(tmp_path, n=300):
+    rec = Recorder(str(tmp_path), index_every_ns=100_000)
+    for i in range(n):
+        venue = "okx" if i % 2 else "binance"
+        rec.log("market_data", {"venue": venue, "symbol": "BTCUSDT", "t_arrive_ns": time.time_ns(),
+                                "mid": 100.0 + i, "bid": 99.5 + i, "ask": 100.5 + i})
+        if i % 10 == 0:
+            time.sleep(0.0002)
+    rec.close()
+    return next(tmp_path.glob("market_data_*.jsonl"))
+
+def test_load_range_matches_full_scan(tmp_path):
+    path = _record(tmp_path)
+    full = load_jsonl(str(path))
+    t = full.t_arrive_ns.sort_values().tolist()
+    t0, t1 = t[100], t[200]
+    want = full[(full.t_arrive_ns >= t0) & (full.t_arrive_ns < t1) & (full.venue == "okx")]
+    got = load_range(str(path), t0, t1, venue="okx")
+    assert got.mid.tolist() == want.mid.tolist()
+
+def test_index_points_at_row_starts(tmp_path):
+    path = _record(tmp_path)
+    idx = read_index(str(path))
+    assert len(idx) > 10 and idx[0][1] == 0
+    data = path.read_bytes()
+    assert all(off == 0 or data[off - 1:off] == b"\n" for _, off in idx)
+    # seeking past the first entries must still return exactly the window
+    t0 = idx[5][0]
+    rows = list(iter_range(str(path), t0, t0 + 1))
+    assert [r["t_log_ns"] for r in rows] == [idx[5][0]]
+
+def test_build_index_backfills_old_tapes(tmp_path):
+    path = _record(tmp_path)
+    index_path(path).unlink()
+    assert read_index(str(path)) == []
+    build_index(str(path), every_ns=100_000)
+    first = json.loads(path.open().readline())
+    assert read_index(str(path))[0] == (first["t_log_ns"], 0)
+    assert len(read_index(str(path))) > 10
+
+def test_load_range_reads_quotes_tapes(tmp_path):
+    rec = Recorder(str(tmp_path), index_every_ns=100_000)
+    for i in range(50):
+        rec.log("quotes", {"t_ns": time.time_ns(), "mid": 100.0 + i, "symbol": "BTCUSDT",
+                           "bid": 99.9 + i, "ask": 100.1 + i, "inv": 0, "xskew": 0.0,
+                           "imbalance": 0.1, "sigma": 0.0, "venues_used": ["okx"]})
+    rec.close()
+    path = str(next(tmp_path.glob("quotes_*.jsonl")))
+    full = load_jsonl(path)
+    assert "venue" not in full and len(full) == 50
+    t0, t1 = full.t_ns.iloc[10], full.t_ns.iloc[20]
+    got = load_range(path, t0, t1, symbol="BTCUSDT")
+    assert got.mid.tolist() == full.mid.iloc[10:20].tolist()
+
+def test_read_from_rejects_missing_or_truncated_tapes(tmp_path):
+    import pytest
+    from src.core.reader import read_from
+    path = _record(tmp_path, n=5)
+    rows, offset = read_from(str(path), 0)
+    assert len(rows) == 5
+    path.write_bytes(path.read_bytes()[:offset // 2])
+    with pytest.raises(ValueError, match="truncated"):
+        read_from(str(path), offset)
+    with pytest.raises(FileNotFoundError):
+        read_from(str(tmp_path / "missing.jsonl"), 0)
+
+def test_iter_range_keeps_rows_sharing_the_entry_timestamp(tmp_path):
+    # coarse clock: three rows logged at t=20, the index entry points at the last of them
+    path = tmp_path / "market_data_x.jsonl"
+    lines = [json.dumps({"t_log_ns": t, "t_arrive_ns": t, "symbol": "BTCUSDT", "venue": "okx",
+                         "mid": float(k), "bid": 0.0, "ask": 0.0}) + "\n"
+             for k, t in enumerate((10, 20, 20, 20, 30))]
+    path.write_text("".join(lines))
+    offsets = [sum(len(l) for l in lines[:k]) for k in range(len(lines))]
+    index_path(path).write_text(f"10 {offsets[0]}\n20 {offsets[3]}\n")
+    rows = list(iter_range(str(path), 20, 21, ts_col="t_arrive_ns"))
+    assert [r["mid"] for r in rows] == [1.0, 2.0, 3.0]
@@ -0,0 +1,77 @@
+import asyncio
+import random
+from src.connectors.supervisor import Backoff, FeedHealth, Supervisor
+
+def test_backoff_is_jittered_and_capped():
+    b = Backoff(base=0.1, cap=1.0, rng=random.Random(7))
+    delays = [b.next() for _ in range(20)]
+    assert all(0.0 <= d <= min(1.0, 0.1 * 2 ** i) for i, d in enumerate(delays))
+    assert len(set(delays)) == len(delays)
+    b.reset()
+    assert b.attempt == 0
+
+def test_health_counts_gaps_and_downtime():
+    h = FeedHealth("okx", gap_ns=1_000)
+    h.on_connect(0)
+    for t in (100, 200, 5_000, 5_100):
+        h.on_message(t)
+    assert h.gaps == 1 and h.max_gap_ns == 4_800
+    h.on_disconnect(6_000, ConnectionError("reset"))
+    h.on_connect(9_000)
+    snap = h.snapshot(10_000)
+    assert snap["reconnects"] == 1 and snap["errors"] == 1
+    assert snap["downtime_ns"] == 3_000 and snap["staleness_ns"] == 4_900
+
+def test_supervisor_reconnects_after_errors():
+    calls = []
+
+    async def session(health):
+        calls.append(1)
+        health.on_connect(len(calls))
+        if len(calls) < 3:
+            raise ConnectionError("boom")
+        await asyncio.sleep(10)
+
+    async def go():
+        sup = Supervisor("test", Backoff(base=0.001, cap=0.001))
+        task = asyncio.create_task(sup.run(session))
+        while len(calls) < 3:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        return sup
+
+    sup = asyncio.run(go())
+    assert sup.health.reconnects == 2 and sup.health.errors == 2
+
+def test_eventloop_run_cancels_main_on_interrupt():
+    import signal, subprocess, sys
+    code = (
+        "import asyncio, sys\n"
+        "from src.connectors import eventloop\n"
+        "async def main():\n"
+        "    print('ready', flush=True)\n"
+        "    try:\n"
+        "        await asyncio.sleep(60)\n"
+        "    finally:\n"
+        "        print('cleaned', flush=True)\n"
+        "try:\n"
+        "    eventloop.run(main())\n"
+        "except KeyboardInterrupt:\n"
+        "    pass\n"
+    )
+    proc = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True)
+    assert proc.stdout.readline().strip() == "ready"
+    proc.send_signal(signal.SIGINT)
+    out, _ = proc.communicate(timeout=10)
+    assert "cleaned" in out
+
+def test_health_tracks_venue_errors_and_symbol_staleness():
+    h = FeedHealth("okx")
+    h.on_connect(0)
+    h.on_message(100, "BTCUSDT")
+    h.on_message(300, "ETHUSDT")
+    h.on_error("okx error 60018: instId doesn't exist")
+    snap = h.snapshot(1_000)
+    assert snap["errors"] == 1 and snap["connected"]
+    assert snap["symbols"] == {"BTCUSDT": {"last_msg_ns": 100, "staleness_ns": 900},
+                               "ETHUSDT": {"last_msg_ns": 300, "staleness_ns": 700}}